@@ -0,0 +1,272 @@
+import os
+import logging
+import argparse
+import fnmatch
+import functools
+import hashlib
+import pickle
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from schemata.parser import *
+from schemata.exporters import *
+from lxml.etree import parse, fromstring, iterparse, XMLParser, XMLSchema, XMLSyntaxError, tostring
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def toJSONDefault(o):
+    # Used to serialise any Schemata objects that are left in the output of toJSON().
+    if hasattr(o, "toJSON"):
+        return o.toJSON()
+
+    raise TypeError("Object of type {} is not JSON serializable.".format(type(o).__name__))
+
+
+def dumpJSON(schema, fp):
+    # orjson is much quicker than the standard library, but it's optional. It only supports an indent of two spaces,
+    # so the standard library is set up to give the same output. Without orjson, the schema streams its own JSON to
+    # the file rather than building the whole dictionary first.
+    if orjson is not None:
+        Path(fp).write_bytes(orjson.dumps(schema.toJSON(), default=toJSONDefault, option=orjson.OPT_INDENT_2))
+    else:
+        with open(fp, "w", encoding="utf-8") as fo:
+            schema.writeJSON(fo, indent=2)
+
+
+# Each worker process creates one parser when it starts, and reuses it for every file it is given. The parser keeps no
+# state between files, and anything that only needs setting up once (e.g., compiled regular expressions) is held at
+# class level, so there's nothing to rebuild per file. Creating the parser in the worker also means it never needs
+# to be pickled.
+parser = None
+
+
+def initialiseWorker(cache=False, logLevel=logging.WARNING):
+    global parser, useCache
+
+    # Worker processes that are spawned rather than forked don't inherit the logging set-up, so it's done again here 
+    # with the parent's level. This does nothing if the worker already has handlers.
+    logging.basicConfig(level=logLevel)
+
+    parser = Parser()
+    useCache = cache
+
+
+# Parsed schemas can be cached on disk between runs, keyed by a hash of the schema file's contents. The hash is keyed in 
+# turn by a hash of the parser and structures source files, so any change to either of them makes the old entries 
+# unreachable. Cache entries are unpickled, which can run arbitrary code, so the cache is only used when it's turned 
+# on with --cache, and the cache directory must only be writable by people you trust.
+cacheDirectory = ".schemata_cache"
+
+# Whether the worker processes use the cache. This is set when each worker starts.
+useCache = False
+
+
+@functools.lru_cache(maxsize=None)
+def getCacheKey():
+    # Only worked out the first time the cache is used in each process, so runs without --cache never read the sources.
+    return hashlib.blake2b(b"".join(Path(__file__).with_name(name).read_bytes() for name in ["parser.py", "structures.py"])).digest()
+
+
+def parseSchemaCached(buffer, fp):
+    key = hashlib.blake2b(buffer, digest_size=16, key=getCacheKey()).hexdigest()
+    cachePath = os.path.join(cacheDirectory, key + ".pickle")
+
+    try:
+        with open(cachePath, "rb") as fo:
+            return pickle.load(fo)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    schema = parser.parseSchemaFromBytes(buffer, fp)
+
+    # Schemas that import other files aren't cached, as the hash only covers this file and not its imports.
+    if len(schema.dependencies) == 0:
+        os.makedirs(cacheDirectory, exist_ok=True)
+
+        # Write to a temporary file first, so that other workers never read a half-written entry.
+        temporaryPath = "{}.{}.tmp".format(cachePath, os.getpid())
+
+        with open(temporaryPath, "wb") as fo:
+            pickle.dump(schema, fo, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporaryPath, cachePath)
+
+    return schema
+
+
+def generateFile(fp):
+    logging.info("Generating an XSD file from %s.", fp)
+
+    # Read the source file in one go and hand the bytes straight to the parser, unless it's been parsed before.
+    buffer = Path(fp).read_bytes()
+    schema = parseSchemaCached(buffer, fp) if useCache else parser.parseSchemaFromBytes(buffer, fp)
+
+    dumpJSON(schema, fp[:-7] + ".json")
+
+    # Serialise the XSD document in one call and write it in one go.
+    xsdElement = exportSchemaAsXSDTree(schema, "vTest")
+    Path(fp[:-7] + ".xsd").write_bytes(tostring(xsdElement, xml_declaration=True, encoding="UTF-8"))
+
+
+def listFiles(directory, pattern):
+    # Lists the files in the directory whose names match the pattern. The DirEntry objects are returned, rather than
+    # the paths, so that callers can reuse the stat information that os.scandir() has already collected.
+    with os.scandir(directory) as entries:
+        return [e for e in entries if e.is_file() and fnmatch.fnmatch(e.name, pattern)]
+
+
+def needsRebuild(fp, sourceTime):
+    # A schema file only needs to be regenerated if one of its outputs is missing or older than it is.
+    # Note that changes to any files imported by the schema file are not picked up here.
+    for outputPath in [fp[:-7] + ".json", fp[:-7] + ".xsd"]:
+        try:
+            if os.stat(outputPath).st_mtime < sourceTime:
+                return True
+        except FileNotFoundError:
+            return True
+
+    return False
+
+
+def generate(directory="examples", pattern="*.schema", jobs=None, cache=False):
+    fps = [e.path for e in listFiles(directory, pattern) if needsRebuild(e.path, e.stat().st_mtime)]
+
+    if not fps:
+        logging.info("All generated files are up to date.")
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initialiseWorker, initargs=(cache, logging.getLogger().getEffectiveLevel())) as executor:
+        list(executor.map(generateFile, fps))
+
+
+# Options for the XML parsers used during validation. IDs aren't needed, entities are never resolved, and the size
+# limits are lifted so that large example files can be checked. Blank text is only insignificant in the XSD files, so
+# it's kept when parsing the example files.
+xmlParserOptions = {
+    "collect_ids": False,
+    "resolve_entities": False,
+    "huge_tree": True
+}
+
+xsdParser = XMLParser(remove_blank_text=True, **xmlParserOptions)
+
+
+# Compiled XSD files, keyed by file path. Each value is a tuple of the modification time of the XSD file and the
+# compiled XMLSchema object. XMLSchema objects can't be pickled, so this only lasts for the current process.
+xmlSchemaCache = {}
+
+
+def loadXMLSchema(fp):
+    # Compiling an XSD file is the expensive part of validation, so reuse the compiled schema for as long as the
+    # XSD file hasn't changed.
+    mtime = os.path.getmtime(fp)
+    cachedSchema = xmlSchemaCache.get(fp)
+
+    if cachedSchema is not None and cachedSchema[0] == mtime:
+        return cachedSchema[1]
+
+    schema = XMLSchema(parse(fp, xsdParser))
+    xmlSchemaCache[fp] = (mtime, schema)
+
+    return schema
+
+
+def validateStream(fp, schema):
+    # Validates the XML file while it's being parsed, rather than building the whole tree and then walking it again.
+    # Each element is cleared once it has been checked. Returns None if the file is valid, or the error if it isn't.
+    try:
+        for _, element in iterparse(fp, events=("end",), schema=schema, **xmlParserOptions):
+            element.clear()
+    except XMLSyntaxError as e:
+        return e
+
+    return None
+
+
+def validateBytes(fp, schema):
+    # The invalid examples are small, so they're read in one go and parsed straight from the bytes into an element,
+    # rather than being streamed. Returns None if the file is valid, or the error if it isn't.
+    try:
+        fromstring(Path(fp).read_bytes(), XMLParser(schema=schema, **xmlParserOptions))
+    except XMLSyntaxError as e:
+        return e
+
+    return None
+
+
+def validate(directory="examples", jobs=None):
+    fps1 = [e.path for e in listFiles(directory, "*.xsd")]
+
+    # lxml releases the GIL while it parses and validates, so a thread pool is enough to check the example files in
+    # parallel. Each check makes its own validation context, so the compiled schemas can be shared between threads.
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        checks = []
+
+        for fp1 in fps1:
+            schema = loadXMLSchema(fp1)
+
+            fps2 = [fp1[:-4] + ".xml"]
+            fps3 = []
+
+            validChecks = [(fp, executor.submit(validateStream, fp, schema)) for fp in fps2]
+            invalidChecks = [(fp, executor.submit(validateBytes, fp, schema)) for fp in fps3]
+
+            checks.append((validChecks, invalidChecks))
+
+        # Collect the results in order, so that the log reads the same as if the checks were run one by one.
+        for validChecks, invalidChecks in checks:
+            logging.info("Checking that all valid examples pass when validated against the XSD file.")
+
+            for fp3, future in validChecks:
+                error = future.result()
+
+                if error is None:
+                    logging.info(" - %s passes.", fp3)
+                else:
+                    logging.info(" - %s does not pass.", fp3)
+
+                    raise error
+
+            logging.info("Checking that all invalid examples fail when validated against the XSD file.")
+
+            for fp4, future in invalidChecks:
+                error = future.result()
+
+                if error is not None:
+                    logging.info(" - %s fails.", fp4)
+                else:
+                    logging.info(" - %s does not fail.", fp4)
+
+                    raise Exception("{} should fail validation, but doesn't.".format(fp4))
+
+
+def main(argv=None):
+    argumentParser = argparse.ArgumentParser(description="Generates the example files and validates them.")
+    argumentParser.add_argument("--dir", default="examples", help="the directory containing the example files")
+    argumentParser.add_argument("--generate-only", action="store_true", help="only generate the JSON and XSD files")
+    argumentParser.add_argument("--validate-only", action="store_true", help="only validate the example XML files")
+    argumentParser.add_argument("--jobs", type=int, default=os.cpu_count(), help="the number of workers to use")
+    argumentParser.add_argument("--pattern", default="*.schema", help="the names of the schema files to generate from")
+    argumentParser.add_argument("--cache", action="store_true", help="reuse parsed schemas from (and save them to) the .schemata_cache directory; only use this if that directory can't be written by anyone you don't trust")
+    arguments = argumentParser.parse_args(argv)
+
+    if arguments.generate_only and arguments.validate_only:
+        argumentParser.error("--generate-only and --validate-only can't be used together.")
+
+    if arguments.jobs is not None and arguments.jobs < 1:
+        argumentParser.error("--jobs must be at least 1.")
+
+    logging.basicConfig(level=logging.DEBUG)
+
+    if not arguments.validate_only:
+        generate(arguments.dir, arguments.pattern, arguments.jobs, arguments.cache)
+
+    if not arguments.generate_only:
+        validate(arguments.dir, arguments.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
+import io 
 import os 
 import logging 
-import re
 from lxml.etree import ElementTree as XMLElementTree, Element as XMLElement, SubElement as XMLSubelement, Comment as XMLComment, QName, indent 
 import json 
 from schemata.structures import * 
@@ -23,6 +23,21 @@ class JSONSchemasExporter(object):
     _js : string
         The JSON Schemas specification being used. This is the value of the $schema property. Do not change. 
     """
+
+    # The JSON Schemas type for each built-in Schemata data type, for property values and for array items.
+    _propertyTypes = {
+        "string": "string",
+        "integer": "integer",
+        "decimal": "number",
+        "boolean": "boolean"
+    }
+    _itemTypes = {
+        "string": "string",
+        "integer": "integer",
+        "decimal": "decimal",
+        "boolean": "boolean"
+    }
+
     def __init__(self):
         self._js = "https://json-schema.org/draft/2020-12/schema"
 
@@ -86,26 +101,23 @@ class JSONSchemasExporter(object):
 
         jsonObject["type"] = "array"
 
-        if _array.itemTypeReference == "string":
-            jsonObject["items"] = {"type": "string"}
-        elif _array.itemTypeReference == "integer":
-            jsonObject["items"] = {"type": "integer"}
-        elif _array.itemTypeReference == "decimal":
-            jsonObject["items"] = {"type": "decimal"}
-        elif _array.itemTypeReference == "boolean":
-            jsonObject["items"] = {"type": "boolean"}
+        itemType = JSONSchemasExporter._itemTypes.get(_array.itemTypeReference)
+
+        if itemType is not None:
+            jsonObject["items"] = {"type": itemType}
         elif isinstance(_array.itemType, DataStructure):
             ds = _array.itemType
 
             if ds.baseStructureReference == "string":
-                jsonObject["items"] = {}
-                jsonObject["items"]["type"] = "string"
+                items = {"type": "string"}
 
                 if ds.allowedPattern != "":
-                    jsonObject["items"]["pattern"] = ds.allowedPattern
+                    items["pattern"] = ds.allowedPattern
 
                 if ds.allowedValues != []:
-                    jsonObject["items"]["enum"] = ds.allowedValues
+                    items["enum"] = ds.allowedValues
+
+                jsonObject["items"] = items
 
     def _exportObject(self, schema, _object, jsonObject):
         """
@@ -127,21 +139,23 @@ class JSONSchemasExporter(object):
 
         logger.debug("Exporting object structure {}.".format(_object.reference))
 
+        properties = {}
+        required = []
+
         jsonObject["type"] = "object"
-        jsonObject["properties"] = {}
-        jsonObject["required"] = []
+        jsonObject["properties"] = properties
+        jsonObject["required"] = required
         jsonObject["additionalProperties"] = False
 
         for _property in _object.properties:
             p = _property.propertyStructure
             pn = p.propertyName
-            jsonObject["properties"][pn] = {}
-            jsonObject["properties"][pn]["description"] = p.metadata.description
+            properties[pn] = {"description": p.metadata.description}
 
-            self._exportProperty(schema, p, jsonObject["properties"][pn])
+            self._exportProperty(schema, p, properties[pn])
 
             if _property.isOptional == False:
-                jsonObject["required"].append(pn)
+                required.append(pn)
 
     def _exportProperty(self, schema, _property, jsonObject):
         """
@@ -163,14 +177,10 @@ class JSONSchemasExporter(object):
 
         logger.debug("Exporting property structure {}.".format(_property.reference))
 
-        if _property.valueTypeReference == "string":
-            jsonObject["type"] = "string"
-        elif _property.valueTypeReference == "integer":
-            jsonObject["type"] = "integer"
-        elif _property.valueTypeReference == "decimal":
-            jsonObject["type"] = "number"
-        elif _property.valueTypeReference == "boolean":
-            jsonObject["type"] = "boolean"
+        valueType = JSONSchemasExporter._propertyTypes.get(_property.valueTypeReference)
+
+        if valueType is not None:
+            jsonObject["type"] = valueType
         elif isinstance(_property.valueType, DataStructure):
             ds = _property.valueType
 
@@ -207,21 +217,100 @@ class XSDExporter(object):
         closely matches how Schemata works, making the export easier. This string is a prefix that's applied to type names
         in the XSD, to distinguish them easily from other kinds of elements. You can change this if you want, but there's
         not much point. Set to '__type__' by default.
+    _typeNames : dict
+        The XSD type name of each structure that has been exported so far.
+    _qualifiedNames : dict
+        The qualified name of each XSD element that the exporter creates, keyed by local name. These are created once 
+        here, rather than every time an element is created.
     """
 
+    # The XSD base type for each built-in base of a data structure, and the name of the method that exports the facets
+    # for that base, if it has any.
+    _dataStructureBases = {
+        "string": ("xs:string", "_exportStringFacets"),
+        "decimal": ("xs:decimal", None),
+        "integer": ("xs:integer", "_exportIntegerFacets"),
+        "boolean": ("xs:boolean", None)
+    }
+
+    # The XSD type used for attributes whose data structure is one of these base types.
+    _attributeBaseTypes = {
+        "string": "xs:string",
+        "integer": "xs:integer",
+        "boolean": "xs:boolean"
+    }
+
+    # The XSD type used as the base for the values of elements whose value type is one of these base types.
+    _valueBaseTypes = {
+        "decimal": "xs:decimal",
+        "integer": "xs:integer",
+        "boolean": "xs:boolean"
+    }
+
+    # The XSD indicator that each kind of structure list is exported as, and the minOccurs and maxOccurs to put on the 
+    # indicator, if any.
+    _structureListIndicators = {
+        OrderedStructureList: ("sequence", None, None),
+        UnorderedStructureList: ("choice", "0", "unbounded"),
+        StructureChoice: ("choice", None, None)
+    }
+    _structureListTypes = (OrderedStructureList, UnorderedStructureList, StructureChoice)
+
+    # The method that exports each kind of element structure, keyed by the kind of content the element can have and 
+    # whether it has attributes.
+    _elementStructureExporters = {
+        ("empty", False): "_exportEmptyElementStructure",
+        ("empty", True): "_exportEmptyElementStructure",
+        ("elements", False): "_exportElementsElementStructure",
+        ("elements", True): "_exportElementsElementStructure",
+        ("elementsAndText", False): "_exportElementsAndTextElementStructure",
+        ("elementsAndText", True): "_exportElementsAndTextElementStructure",
+        ("text", False): "_exportTextElementStructure",
+        ("text", True): "_exportTextElementStructureWithAttributes",
+        ("value", False): "_exportValueElementStructure",
+        ("value", True): "_exportValueElementStructureWithAttributes"
+    }
+
     def __init__(self):
         self._xs = "http://www.w3.org/2001/XMLSchema"
         self._typePrefix = "__type__"
+        self._typeNames = {}
+        self._qualifiedNames = {name: QName(self._xs, name) for name in (
+            "attribute",
+            "choice",
+            "complexType",
+            "element",
+            "enumeration",
+            "extension",
+            "maxInclusive",
+            "minInclusive",
+            "pattern",
+            "restriction",
+            "schema",
+            "sequence",
+            "simpleContent",
+            "simpleType"
+        )}
 
     def _getXSDTypeName(self, structure):
+        # The same structures are referred to many times in an export, so each type name is only worked out once.
+        typeName = self._typeNames.get(structure)
+
+        if typeName is not None:
+            return typeName 
+
         if isinstance(structure, DataStructure):
-            return self._typePrefix + "d__" + structure.reference 
-        if isinstance(structure, ElementStructure):
-            return self._typePrefix + "e__" + structure.reference 
-        if isinstance(structure, AttributeStructure):
-            return self._typePrefix + "a__" + structure.reference 
+            typeName = self._typePrefix + "d__" + structure.reference 
+        elif isinstance(structure, ElementStructure):
+            typeName = self._typePrefix + "e__" + structure.reference 
+        elif isinstance(structure, AttributeStructure):
+            typeName = self._typePrefix + "a__" + structure.reference 
+        else:
+            raise Exception("Cannot create XSD type name for {}.".format(structure.reference))
+
+        self._typeNames[structure] = typeName
 
-        raise Exception("Cannot create XSD type name for {}.".format(structure.reference))
+        return typeName 
 
     def exportSchema(self, schema, versionNumber, filePath = ""):
         """
@@ -241,11 +330,11 @@ class XSDExporter(object):
         An ElementTree which is the XSD schema.
         """
 
-        xs = self._xs
+        qualifiedNames = self._qualifiedNames
 
         logging.debug("Exporting schema for {} as XSD.".format(schema.formatName))
 
-        e1 = XMLElement(QName(xs, "schema"))
+        e1 = XMLElement(qualifiedNames["schema"])
         e1.set("elementFormDefault", "qualified")
 
         # Put a comment at the top of the XSD file saying what XML format it's for.
@@ -266,17 +355,21 @@ class XSDExporter(object):
         for root in roots:
             logging.debug("Exporting element <{}>.".format(root.elementName))
 
-            e2 = XMLElement(QName(xs, "element"))
+            e2 = XMLElement(qualifiedNames["element"])
             e2.set("name", root.elementName)
             e2.set("type", self._getXSDTypeName(root))
 
             e1.append(e2)
 
+        # Indent the tree here rather than pretty printing it when it's serialised. The tree is then only formatted once,
+        # and with four-space indentation. The tail on the root element ends the document with a line break, as pretty 
+        # printing would.
         tree = XMLElementTree(e1)
         indent(tree, space="    ")
+        e1.tail = "\n"
 
         if filePath != "":
-            tree.write(filePath, xml_declaration=True, encoding="utf-8", pretty_print=True)
+            tree.write(filePath, xml_declaration=True, encoding="utf-8")
 
         return tree 
 
@@ -296,7 +389,7 @@ class XSDExporter(object):
         None 
         """
 
-        xs = self._xs 
+        qualifiedNames = self._qualifiedNames
 
         logging.debug("Exporting data structures.")
 
@@ -309,80 +402,99 @@ class XSDExporter(object):
 
             logging.debug("Exporting data structure '{}'.".format(dataStructure.reference))
 
-            e1 = XMLElement(QName(xs, "simpleType"))
+            e1 = XMLElement(qualifiedNames["simpleType"])
             e1.set("name", self._getXSDTypeName(dataStructure))
 
-            if dataStructure.baseStructureReference == "string":
-                logging.debug(f"'{dataStructure.reference}' has an XSD base of string.")
+            base = XSDExporter._dataStructureBases.get(dataStructure.baseStructureReference)
 
-                e2 = XMLElement(QName(xs, "restriction"))
-                e2.set("base", "xs:string")
+            if base is not None:
+                xsdBase, facetExporterName = base
 
-                if dataStructure.allowedPattern != "":
-                    logging.debug(f"Setting pattern value to '{dataStructure.allowedPattern}'")
+                logging.debug(f"'{dataStructure.reference}' has an XSD base of {dataStructure.baseStructureReference}.")
 
-                    e3 = XMLElement(QName(xs, "pattern"))
-                    e3.set("value", dataStructure.allowedPattern)
+                e2 = XMLElement(qualifiedNames["restriction"])
+                e2.set("base", xsdBase)
 
-                    e2.append(e3)
+                if facetExporterName is not None:
+                    getattr(self, facetExporterName)(dataStructure, e2)
 
-                elif dataStructure.allowedValues:
-                    logging.debug(f"Setting enumeration values.")
+                e1.append(e2)
 
-                    for value in dataStructure.allowedValues:
-                        e3 = XMLElement(QName(xs, "enumeration"))
-                        e3.set("value", value)
+            xsdElement.append(e1)
 
-                        e2.append(e3)
+            logging.debug("Exported data structure '{}'.".format(dataStructure.reference))
 
-                e1.append(e2)
+        logging.debug("Exported data structures.")
+    
+    def _exportStringFacets(self, dataStructure, xsdElement):
+        """
+        Exports the allowed pattern or allowed values of a data structure with a base of string, as XSD facets.
 
-            elif dataStructure.baseStructureReference == "decimal":
-                logging.debug(f"'{dataStructure.reference}' has an XSD base of decimal.")
+        Parameters
+        ----------
+        dataStructure : DataStructure
+            The data structure being exported.
+        xsdElement : Element
+            The restriction element to which to attach the facets.
 
-                e2 = XMLElement(QName(xs, "restriction"))
-                e2.set("base", "xs:decimal")
+        Returns
+        -------
+        None 
+        """
 
-                e1.append(e2)
+        qualifiedNames = self._qualifiedNames
 
-            elif dataStructure.baseStructureReference == "integer":
-                logging.debug(f"'{dataStructure.reference}' has an XSD base of integer.")
+        if dataStructure.allowedPattern != "":
+            logging.debug(f"Setting pattern value to '{dataStructure.allowedPattern}'")
 
-                e2 = XMLElement(QName(xs, "restriction"))
-                e2.set("base", "xs:integer")
+            e1 = XMLElement(qualifiedNames["pattern"])
+            e1.set("value", dataStructure.allowedPattern)
 
-                if dataStructure.minimumValue != None:
-                    logging.debug(f"Setting minInclusive value.")
+            xsdElement.append(e1)
 
-                    e3 = XMLElement(QName(xs, "minInclusive"))
-                    e3.set("value", str(dataStructure.minimumValue))
+        elif dataStructure.allowedValues:
+            logging.debug(f"Setting enumeration values.")
 
-                    e2.append(e3)
+            for value in dataStructure.allowedValues:
+                e1 = XMLElement(qualifiedNames["enumeration"])
+                e1.set("value", value)
 
-                if dataStructure.maximumValue != None:
-                    logging.debug(f"Setting maxInclusive value.")
+                xsdElement.append(e1)
 
-                    e3 = XMLElement(QName(xs, "maxInclusive"))
-                    e3.set("value", str(dataStructure.maximumValue))
+    def _exportIntegerFacets(self, dataStructure, xsdElement):
+        """
+        Exports the minimum and maximum values of a data structure with a base of integer, as XSD facets.
 
-                    e2.append(e3)
+        Parameters
+        ----------
+        dataStructure : DataStructure
+            The data structure being exported.
+        xsdElement : Element
+            The restriction element to which to attach the facets.
 
-                e1.append(e2)
+        Returns
+        -------
+        None 
+        """
 
-            elif dataStructure.baseStructureReference == "boolean":
-                logging.debug(f"'{dataStructure.reference}' has an XSD base of boolean.")
+        qualifiedNames = self._qualifiedNames
 
-                e2 = XMLElement(QName(xs, "restriction"))
-                e2.set("base", "xs:boolean")
+        if dataStructure.minimumValue is not None:
+            logging.debug(f"Setting minInclusive value.")
 
-                e1.append(e2)
+            e1 = XMLElement(qualifiedNames["minInclusive"])
+            e1.set("value", str(dataStructure.minimumValue))
 
             xsdElement.append(e1)
 
-            logging.debug("Exported data structure '{}'.".format(dataStructure.reference))
+        if dataStructure.maximumValue is not None:
+            logging.debug(f"Setting maxInclusive value.")
+
+            e1 = XMLElement(qualifiedNames["maxInclusive"])
+            e1.set("value", str(dataStructure.maximumValue))
+
+            xsdElement.append(e1)
 
-        logging.debug("Exported data structures.")
-    
     def _exportElementStructures(self, schema, xsdElement):
         """
         Exports all of the element structures in the schema.
@@ -399,8 +511,6 @@ class XSDExporter(object):
         None 
         """
 
-        xs = self._xs 
-
         logging.debug("Exporting element structures.")
 
         elementStructures = schema.getElementStructures()
@@ -413,111 +523,267 @@ class XSDExporter(object):
             logging.debug("Exporting element structure '{}' <{}>.".format(elementStructure.reference, elementStructure.elementName))
 
             # Here we decide whether the element is a 'simpleType' element or a 'complexType' element - it's quite an unintuitive distinction.
-            if not elementStructure.hasContent:
+            # It depends on the kind of content the element can have and on whether it has attributes.
+            methodName = XSDExporter._elementStructureExporters.get((self._getContentKind(elementStructure), elementStructure.hasAttributes))
 
-                e1 = XMLElement(QName(xs, "complexType"))
-                e1.set("name", self._getXSDTypeName(elementStructure))
+            if methodName is None:
+                logging.warn("Could not export element structure '{}' <{}>.".format(elementStructure.reference, elementStructure.elementName))
+                continue 
 
-                self._exportAttributes(schema, elementStructure.attributes, e1)
+            getattr(self, methodName)(schema, elementStructure, xsdElement)
 
-                xsdElement.append(e1)
+    def _getContentKind(self, elementStructure):
+        """
+        Works out what kind of content an element structure can have, looking at its content only once.
 
-            elif elementStructure.contentIsElementsOnly:
+        Parameters
+        ----------
+        elementStructure : ElementStructure
+            The element structure.
 
-                e1 = XMLElement(QName(xs, "complexType"))
-                e1.set("name", self._getXSDTypeName(elementStructure))
-                e1.set("mixed", "false")
+        Returns
+        -------
+        'empty', 'elements', 'elementsAndText', 'text', or 'value', or None if the content is none of these.
+        """
 
-                self._exportSubelements(schema, elementStructure.allowedContent, e1)
-                self._exportAttributes(schema, elementStructure.attributes, e1)
+        if not elementStructure.hasContent:
+            return "empty"
 
-                xsdElement.append(e1)
+        containsElements = elementStructure.containsElementUsageReference
+        containsText = elementStructure.containsAnyTextUsageReference
 
-            elif elementStructure.contentIsElementsAndAnyText:
+        if containsElements:
+            return "elementsAndText" if containsText else "elements"
 
-                e1 = XMLElement(QName(xs, "complexType"))
-                e1.set("name", self._getXSDTypeName(elementStructure))
-                e1.set("mixed", "true")
+        if containsText:
+            return "text"
 
-                self._exportSubelements(schema, elementStructure.allowedContent, e1)
-                self._exportAttributes(schema, elementStructure.attributes, e1)
+        if elementStructure.contentIsSingleValue:
+            return "value"
 
-                xsdElement.append(e1)
+        return None 
 
-            elif elementStructure.contentIsAnyText and elementStructure.hasAttributes:
+    def _exportEmptyElementStructure(self, schema, elementStructure, xsdElement):
+        """
+        Exports an element structure that has no content, as a complexType with only attributes.
 
-                e1 = XMLElement(QName(xs, "complexType"))
-                e1.set("name", self._getXSDTypeName(elementStructure))
+        Parameters
+        ----------
+        schema : Schema
+            The schema being exported.
+        elementStructure : ElementStructure
+            The element structure being exported.
+        xsdElement : Element
+            The XML element to which to attach this element structure.
 
-                e2 = XMLElement(QName(xs, "simpleContent"))
+        Returns
+        -------
+        None 
+        """
 
-                e3 = XMLElement(QName(xs, "extension"))            
-                e3.set("base", "xs:string")
+        e1 = XMLElement(self._qualifiedNames["complexType"])
+        e1.set("name", self._getXSDTypeName(elementStructure))
 
-                self._exportAttributes(schema, elementStructure.attributes, e3)
+        self._exportAttributes(schema, elementStructure.attributes, e1)
 
-                e2.append(e3)
-                e1.append(e2)
-                xsdElement.append(e1)
+        xsdElement.append(e1)
 
-            elif elementStructure.contentIsAnyText and not elementStructure.hasAttributes:
+    def _exportElementsElementStructure(self, schema, elementStructure, xsdElement, mixed = "false"):
+        """
+        Exports an element structure whose content includes elements, as a complexType with subelements and attributes.
 
-                e1 = XMLElement(QName(xs, "simpleType"))
-                e1.set("name", self._getXSDTypeName(elementStructure))
+        Parameters
+        ----------
+        schema : Schema
+            The schema being exported.
+        elementStructure : ElementStructure
+            The element structure being exported.
+        xsdElement : Element
+            The XML element to which to attach this element structure.
+        mixed : string
+            The value of the complexType's 'mixed' attribute.
 
-                e2 = XMLElement(QName(xs, "restriction"))            
-                e2.set("base", "xs:string")
+        Returns
+        -------
+        None 
+        """
 
-                e1.append(e2)
-                xsdElement.append(e1)
+        e1 = XMLElement(self._qualifiedNames["complexType"])
+        e1.set("name", self._getXSDTypeName(elementStructure))
+        e1.set("mixed", mixed)
 
-            elif elementStructure.contentIsSingleValue and elementStructure.hasAttributes:
+        e1.extend(self._exportSubelements(schema, elementStructure.allowedContent))
+        self._exportAttributes(schema, elementStructure.attributes, e1)
 
-                e1 = XMLElement(QName(xs, "complexType"))
-                e1.set("name", self._getXSDTypeName(elementStructure))
+        xsdElement.append(e1)
 
-                e2 = XMLElement(QName(xs, "simpleContent"))
+    def _exportElementsAndTextElementStructure(self, schema, elementStructure, xsdElement):
+        """
+        Exports an element structure whose content is elements and text, as a mixed complexType.
 
-                e3 = XMLElement(QName(xs, "extension")) 
+        Parameters
+        ----------
+        schema : Schema
+            The schema being exported.
+        elementStructure : ElementStructure
+            The element structure being exported.
+        xsdElement : Element
+            The XML element to which to attach this element structure.
 
-                if elementStructure.valueTypeReference == "decimal":
-                    e3.set("base", "xs:decimal")
-                elif elementStructure.valueTypeReference == "integer":
-                    e3.set("base", "xs:integer")
-                elif elementStructure.valueTypeReference == "boolean":
-                    e3.set("base", "xs:boolean")
-                else:
-                    e3.set("base", self._getXSDTypeName(elementStructure.valueType))
+        Returns
+        -------
+        None 
+        """
 
-                self._exportAttributes(schema, elementStructure.attributes, e3)
+        self._exportElementsElementStructure(schema, elementStructure, xsdElement, mixed = "true")
 
-                e2.append(e3)
-                e1.append(e2)
-                xsdElement.append(e1)
+    def _exportTextElementStructureWithAttributes(self, schema, elementStructure, xsdElement):
+        """
+        Exports an element structure whose content is only text and that has attributes, as a complexType with simpleContent.
 
-            elif elementStructure.contentIsSingleValue and not elementStructure.hasAttributes:
+        Parameters
+        ----------
+        schema : Schema
+            The schema being exported.
+        elementStructure : ElementStructure
+            The element structure being exported.
+        xsdElement : Element
+            The XML element to which to attach this element structure.
 
-                e1 = XMLElement(QName(xs, "simpleType"))
-                e1.set("name", self._getXSDTypeName(elementStructure))
+        Returns
+        -------
+        None 
+        """
 
-                e2 = XMLElement(QName(xs, "restriction"))    
+        qualifiedNames = self._qualifiedNames
 
-                if elementStructure.valueTypeReference == "decimal":
-                    e2.set("base", "xs:decimal")
-                if elementStructure.valueTypeReference == "integer":
-                    e2.set("base", "xs:integer")
-                elif elementStructure.valueTypeReference == "boolean":
-                    e2.set("base", "xs:boolean")
-                else:
-                    e2.set("base", self._getXSDTypeName(elementStructure.valueType))
+        e1 = XMLElement(qualifiedNames["complexType"])
+        e1.set("name", self._getXSDTypeName(elementStructure))
 
-                e1.append(e2)
-                xsdElement.append(e1)
+        e2 = XMLElement(qualifiedNames["simpleContent"])
 
-            else:
-                logging.warn("Could not export element structure '{}' <{}>.".format(elementStructure.reference, elementStructure.elementName))
+        e3 = XMLElement(qualifiedNames["extension"])            
+        e3.set("base", "xs:string")
 
-    def _exportSubelements(self, schema, elements, xsdElement):
+        self._exportAttributes(schema, elementStructure.attributes, e3)
+
+        e2.append(e3)
+        e1.append(e2)
+        xsdElement.append(e1)
+
+    def _exportTextElementStructure(self, schema, elementStructure, xsdElement):
+        """
+        Exports an element structure whose content is only text and that has no attributes, as a simpleType.
+
+        Parameters
+        ----------
+        schema : Schema
+            The schema being exported.
+        elementStructure : ElementStructure
+            The element structure being exported.
+        xsdElement : Element
+            The XML element to which to attach this element structure.
+
+        Returns
+        -------
+        None 
+        """
+
+        qualifiedNames = self._qualifiedNames
+
+        e1 = XMLElement(qualifiedNames["simpleType"])
+        e1.set("name", self._getXSDTypeName(elementStructure))
+
+        e2 = XMLElement(qualifiedNames["restriction"])            
+        e2.set("base", "xs:string")
+
+        e1.append(e2)
+        xsdElement.append(e1)
+
+    def _getValueBaseType(self, elementStructure):
+        """
+        Gets the XSD type to use as the base for the value of an element structure whose content is a single value.
+
+        Parameters
+        ----------
+        elementStructure : ElementStructure
+            The element structure.
+
+        Returns
+        -------
+        The name of the XSD type.
+        """
+
+        xsdType = XSDExporter._valueBaseTypes.get(elementStructure.valueTypeReference)
+
+        return xsdType if xsdType is not None else self._getXSDTypeName(elementStructure.valueType)
+
+    def _exportValueElementStructureWithAttributes(self, schema, elementStructure, xsdElement):
+        """
+        Exports an element structure whose content is a single value and that has attributes, as a complexType with simpleContent.
+
+        Parameters
+        ----------
+        schema : Schema
+            The schema being exported.
+        elementStructure : ElementStructure
+            The element structure being exported.
+        xsdElement : Element
+            The XML element to which to attach this element structure.
+
+        Returns
+        -------
+        None 
+        """
+
+        qualifiedNames = self._qualifiedNames
+
+        e1 = XMLElement(qualifiedNames["complexType"])
+        e1.set("name", self._getXSDTypeName(elementStructure))
+
+        e2 = XMLElement(qualifiedNames["simpleContent"])
+
+        e3 = XMLElement(qualifiedNames["extension"]) 
+
+        e3.set("base", self._getValueBaseType(elementStructure))
+
+        self._exportAttributes(schema, elementStructure.attributes, e3)
+
+        e2.append(e3)
+        e1.append(e2)
+        xsdElement.append(e1)
+
+    def _exportValueElementStructure(self, schema, elementStructure, xsdElement):
+        """
+        Exports an element structure whose content is a single value and that has no attributes, as a simpleType.
+
+        Parameters
+        ----------
+        schema : Schema
+            The schema being exported.
+        elementStructure : ElementStructure
+            The element structure being exported.
+        xsdElement : Element
+            The XML element to which to attach this element structure.
+
+        Returns
+        -------
+        None 
+        """
+
+        qualifiedNames = self._qualifiedNames
+
+        e1 = XMLElement(qualifiedNames["simpleType"])
+        e1.set("name", self._getXSDTypeName(elementStructure))
+
+        e2 = XMLElement(qualifiedNames["restriction"])    
+
+        e2.set("base", self._getValueBaseType(elementStructure))
+
+        e1.append(e2)
+        xsdElement.append(e1)
+
+    def _exportSubelements(self, schema, elements):
         """
         Exports a structure list to XSD.
 
@@ -527,17 +793,16 @@ class XSDExporter(object):
             The schema being exported.
         elements : StructureList
             The structure list being exported (representing the subelements of an element).
-        xsdElement : Element
-            The XML element to which to attach this list.
 
         Returns
         -------
-        None 
+        A list of XML elements to attach to the parent element, which is empty if there is no structure list.
         """
 
-        xs = self._xs 
+        qualifiedNames = self._qualifiedNames
 
-        xsdIndicatorType = "sequence"
+        if elements is None:
+            return []
 
         # Schemata uses a bit more natural language when it comes to lists of elements than XSD does.
         # Here we have to translate from the language of Schemata to the language of XSD.
@@ -545,47 +810,54 @@ class XSDExporter(object):
         # StructureChoice correlates clearly to an XSD choice.
         # UnorderedStructureList can be represented by an XSD choice that can be used any number of times. (This is not perfect.)
         # This here is one of the reasons why Schemata is nicer to use than XSD - this is a pain to do by hand in XSD.
-        if isinstance(elements, OrderedStructureList):
-            e1 = XMLElement(QName(xs, "sequence"))
-        if isinstance(elements, UnorderedStructureList):
-            xsdIndicatorType = "choice"
+        xsdIndicatorType, minOccurs, maxOccurs = XSDExporter._structureListIndicators[type(elements)]
 
-            e1 = XMLElement(QName(xs, "choice"))
-            e1.set("minOccurs", "0")
-            e1.set("maxOccurs", "unbounded")
-        if isinstance(elements, StructureChoice):
-            xsdIndicatorType = "choice"
+        e1 = XMLElement(qualifiedNames[xsdIndicatorType])
 
-            e1 = XMLElement(QName(xs, "choice"))
-        if elements == None:
-            return 
+        if minOccurs is not None:
+            e1.set("minOccurs", minOccurs)
+            e1.set("maxOccurs", maxOccurs)
+
+        # Children are gathered in order, including the indicators of nested lists, and attached with a single extend.
+        children = []
+
+        # These are the same for every element in the list, so look them up once.
+        structureListTypes = XSDExporter._structureListTypes
+        elementName = qualifiedNames["element"]
+        isSequence = xsdIndicatorType == "sequence"
 
         for element in elements.structures:
-            if isinstance(element, OrderedStructureList) or isinstance(element, UnorderedStructureList) or isinstance(element, StructureChoice):
-                self._exportSubelements(schema, element, e1)
+            if isinstance(element, structureListTypes):
+                children.extend(self._exportSubelements(schema, element))
             else:
                 if isinstance(element, AnyTextUsageReference):
                     continue 
 
+                elementStructure = element.elementStructure
+                typeName = self._getXSDTypeName(elementStructure)
+
                 logging.debug(f"Exporting element of type {type(element)}.")
-                logging.debug(f"Exporting {self._getXSDTypeName(element.elementStructure)}.")
+                logging.debug(f"Exporting {typeName}.")
 
-                e3 = XMLElement(QName(xs, "element"))
-                e3.set("name", element.elementStructure.elementName)
-                e3.set("type", self._getXSDTypeName(element.elementStructure))
-                p = element.minimumNumberOfOccurrences
-                q = element.maximumNumberOfOccurrences 
+                e3 = XMLElement(elementName)
+                e3.set("name", elementStructure.elementName)
+                e3.set("type", typeName)
+
+                if isSequence:
+                    p = element.minimumNumberOfOccurrences
+                    q = element.maximumNumberOfOccurrences 
 
-                if xsdIndicatorType == "sequence":
                     if p != 1:
                         e3.set("minOccurs", str(p))
 
                     if q != 1:
                         e3.set("maxOccurs", "unbounded" if q == -1 else str(q))
 
-                e1.append(e3)
+                children.append(e3)
 
-        xsdElement.append(e1)
+        e1.extend(children)
+
+        return [e1]
 
     def _exportAttributes(self, schema, attributes, xsdElement):
         """
@@ -605,28 +877,24 @@ class XSDExporter(object):
         None 
         """
 
-        xs = self._xs 
-        baseTypes = ["string", "integer", "boolean"]
+        qualifiedNames = self._qualifiedNames
+        baseTypes = XSDExporter._attributeBaseTypes
+        children = []
 
         for attribute in attributes:
             a = attribute.attributeStructure 
 
-            e1 = XMLElement(QName(xs, "attribute"))
+            e1 = XMLElement(qualifiedNames["attribute"])
             e1.set("name", a.attributeName)
 
-            if a.dataStructureReference in baseTypes:
-                if a.dataStructureReference == "string":
-                    e1.set("type", "xs:string")
-                if a.dataStructureReference == "integer":
-                    e1.set("type", "xs:integer")
-                if a.dataStructureReference == "boolean":
-                    e1.set("type", "xs:boolean")
-            else:
-                e1.set("type", self._getXSDTypeName(a.dataStructure))
+            xsdType = baseTypes.get(a.dataStructureReference)
+            e1.set("type", xsdType if xsdType is not None else self._getXSDTypeName(a.dataStructure))
 
             e1.set("use", "optional" if attribute.isOptional else "required")
 
-            xsdElement.append(e1)
+            children.append(e1)
+
+        xsdElement.extend(children)
 
 
 class SpecificationGenerator(object):
@@ -644,96 +912,153 @@ class SpecificationGenerator(object):
         pass 
 
     def generateSpecification(self, schema, filePath):
-        with open(filePath, "w") as fileObject:
+        # The whole specification is assembled in memory and written to the file with a single call, rather than with a 
+        # separate write for every line.
+        buffer = io.StringIO()
+        write = buffer.write
 
-            rootElements = schema.getPossibleRootElementStructures()
-            nonRootElements = schema.getNonRootElementStructures()
-            elements = rootElements + nonRootElements 
+        rootElements = schema.getRootElementStructures()
+        nonRootElements = schema.getNonRootElementStructures()
+        elements = rootElements + nonRootElements 
 
-            fileObject.write("# {} Specification\n\n".format(schema.formatName))
-            fileObject.write("This document gives the specification for {}.\n\n".format(schema.formatName))
+        formatName = schema.formatName
 
-            fileObject.write("## Table of Contents\n\n")
+        write(f"# {formatName} Specification\n\n")
+        write(f"This document gives the specification for {formatName}.\n\n")
 
-            for element in elements:
-                fileObject.write("- [The &lt;{}&gt; element](#the-{}-element)\n".format(element.elementName, re.sub("_", "-", element.elementName)))
+        write("## Table of Contents\n\n")
 
-            for element in elements:
-                fileObject.write("\n\n<br /><br />\n\n")
-                fileObject.write("## The &lt;{}&gt; element\n\n".format(element.elementName))
-                fileObject.write("{}\n\n".format(element.description.replace("<", "&lt;").replace(">", "&gt;")))
-                fileObject.write("### Attributes\n\n")
+        for element in elements:
+            elementName = element.elementName
 
-                aa = []
+            write(f"- [The &lt;{elementName}&gt; element](#the-{elementName.replace('_', '-')}-element)\n")
 
-                if element.attributes:
-                    fileObject.write("| Name | Required | Allowed Values | Description |\n")
-                    fileObject.write("|---|---|---|---|\n")
+        for element in elements:
+            # These are used several times in each section, so look them up once.
+            elementName = element.elementName
+            isSelfClosing = element.isSelfClosing
+            description = element.metadata.description.replace("<", "&lt;").replace(">", "&gt;")
 
-                    for attribute in element.attributes:
-                        a = schema.getAttributeStructureByReference(attribute.attributeReference)
-                        d = schema.getDataStructureByReference(a.dataStructure)
-                        aa.append(a)
+            write("\n\n<br /><br />\n\n")
+            write(f"## The &lt;{elementName}&gt; element\n\n")
+            write(f"{description}\n\n")
+            write("### Attributes\n\n")
 
-                        allowedValuesText = d.description
+            # The usage references hold their resolved structures, so no lookups by reference are needed here.
+            aa = [attribute.attributeStructure for attribute in element.attributes]
 
-                        if d.allowedValues and d.description == "":
-                            allowedValuesText = "one of: {}".format(", ".join(["`{}`".format(v) for v in d.allowedValues]))
-                        elif d.allowedPattern and d.description == "" and d.baseStructure == "string":
-                            allowedValuesText = f"a string with the pattern `{d.allowedPattern}`"
+            if aa:
+                write("| Name | Required | Allowed Values | Description |\n")
+                write("|---|---|---|---|\n")
 
-                        fileObject.write("| `{}` | {} | {} | {} |\n".format(a.attributeName, "Required" if not attribute.isOptional else "Optional", allowedValuesText, a.description))
+                for attribute, a in zip(element.attributes, aa):
+                    write(f"| `{a.attributeName}` | {('Optional', 'Required')[not attribute.isOptional]} | {self._getAllowedValuesText(a.dataStructure)} | {a.metadata.description} |\n")
 
-                    fileObject.write("\n")
+                write("\n")
 
-                else:
-                    fileObject.write("None\n\n")
+            else:
+                write("None\n\n")
+
+            write("### Possible Subelements\n\n")
+
+            ee = [subelement.elementStructure for subelement in self._getElementUsageReferences(element.allowedContent)]
+
+            if ee:
+                for e in ee:
+                    write(f"- &lt;{e.elementName}&gt;\n")
 
-                fileObject.write("### Possible Subelements\n\n")
+                write("\n")
 
-                ee = []
+            else:
+                write("None\n\n")
 
-                if element.subelements:
-                    for subelement in element.subelements.elements:
-                        e = schema.getElementStructureByReference(subelement.elementReference)
-                        ee.append(e)
+            write("### Examples\n\n")
+            write(f"Below is shown an example of the `<{elementName}>` element.\n\n")
+            write("```xml\n")
 
-                        fileObject.write("- &lt;{}&gt;\n".format(e.elementName))
+            attributeString = " ".join(f"{a.attributeName}=\"{a.metadata.exampleValue or '...'}\"" for a in aa)
 
-                    fileObject.write("\n")
+            if not isSelfClosing:
+                if aa:
+                    write(f"<{elementName} {attributeString}>\n")
+                else:
+                    write(f"<{elementName}>\n")
 
+                if element.contentIsSingleValue or element.contentIsAnyText:
+                    write(f"    {element.metadata.exampleValue}\n")
                 else:
-                    fileObject.write("None\n\n")
-
-                fileObject.write("### Examples\n\n")
-                fileObject.write("Below is shown an example of the `<{}>` element.\n\n".format(element.elementName))
-                fileObject.write("```xml\n")
-
-                attributeString = " ".join(["{}=\"{}\"".format(a.attributeName, "..." if a.exampleValue == "" else a.exampleValue) for a in aa])
-
-                if element.isSelfClosing == False:
-                    if aa:
-                        fileObject.write("<{} {}>\n".format(element.elementName, attributeString))
-                    else:
-                        fileObject.write("<{}>\n".format(element.elementName))
-
-                    if element.allowedContent == "text only":
-                        fileObject.write("    {}\n".format(element.exampleValue))
-                    else:
-                        for e in ee:
-                            if e.isSelfClosing == False:
-                                fileObject.write("    <{}></{}>\n".format(e.elementName, e.elementName))
-                            else:
-                                fileObject.write("    <{} />\n".format(e.elementName, e.elementName))
-
-                    fileObject.write("</{}>\n".format(element.elementName))
+                    for e in ee:
+                        if e.isSelfClosing == False:
+                            write(f"    <{e.elementName}></{e.elementName}>\n")
+                        else:
+                            write(f"    <{e.elementName} />\n")
+
+                write(f"</{elementName}>\n")
+            else:
+                if aa:
+                    write(f"<{elementName} {attributeString} />\n")
                 else:
-                    if aa:
-                        fileObject.write("<{} {} />\n".format(element.elementName, attributeString))
-                    else:
-                        fileObject.write("<{} />\n".format(element.elementName))
+                    write(f"<{elementName} />\n")
+
+            write("```\n\n")
+
+        with open(filePath, "w", encoding="utf-8") as fileObject:
+            fileObject.write(buffer.getvalue())
+
+    def _getAllowedValuesText(self, dataStructure):
+        """
+        Gets the text describing the values allowed by a data structure, for the attribute tables.
+
+        Parameters
+        ----------
+        dataStructure : DataStructure or ListFunction
+            The data structure.
+
+        Returns
+        -------
+        A string, which is empty if there is nothing to say about the allowed values.
+        """
+
+        if not isinstance(dataStructure, DataStructure):
+            return ""
+
+        description = dataStructure.metadata.description
+
+        if description != "":
+            return description
+
+        if dataStructure.allowedValues:
+            return "one of: " + ", ".join([f"`{v}`" for v in dataStructure.allowedValues])
 
-                fileObject.write("```\n\n")
+        if dataStructure.allowedPattern and dataStructure.baseStructureReference == "string":
+            return f"a string with the pattern `{dataStructure.allowedPattern}`"
+
+        return ""
+
+    def _getElementUsageReferences(self, allowedContent):
+        """
+        Gets the element usage references in the given allowed content, including those in nested structure lists.
+
+        Parameters
+        ----------
+        allowedContent : StructureList or UsageReference
+            The allowed content of an element structure.
+
+        Returns
+        -------
+        A list of element usage references.
+        """
+
+        if allowedContent is None:
+            return []
+
+        if allowedContent._kind == "element":
+            return [allowedContent]
+
+        if allowedContent._kind == "list":
+            return [u for structure in allowedContent.structures for u in self._getElementUsageReferences(structure)]
+
+        return []
 
 
 class ExampleFileGenerator(object):
@@ -767,7 +1092,8 @@ class ExampleFileGenerator(object):
 
             tree = XMLElementTree(e1)
             indent(tree, space="    ")
-            tree.write(filePath, xml_declaration=True, encoding="utf-8", pretty_print=True)
+            e1.tail = "\n"
+            tree.write(filePath, xml_declaration=True, encoding="utf-8")
 
     def _generateAttributes(self, elementStructure, e1):
         for attributeUsageReference in elementStructure.attributes:
@@ -775,12 +1101,12 @@ class ExampleFileGenerator(object):
 
             logger.debug(f"Generating attribute '{s.attributeName}'.")
 
-            if s.dataStructure != None:
+            if s.dataStructure is not None:
                 e1.set(s.attributeName, s.dataStructure.metadata.exampleValue)
 
     def _generateSubelements(self, elementStructure, e1):
         if elementStructure.contentIsSingleValue:
-            if elementStructure.valueType != None:
+            if elementStructure.valueType is not None:
                 e1.text = elementStructure.valueType.metadata.exampleValue
             elif elementStructure.metadata.exampleValue != "":
                 e1.text = elementStructure.metadata.exampleValue
@@ -788,6 +1114,8 @@ class ExampleFileGenerator(object):
             e1.text = elementStructure.metadata.exampleValue 
 
         if isinstance(elementStructure.allowedContent, OrderedStructureList):
+            children = []
+
             for structure in elementStructure.allowedContent.structures:
                 if isinstance(structure, ElementUsageReference):
                     n = 1
@@ -803,7 +1131,9 @@ class ExampleFileGenerator(object):
                         self._generateAttributes(structure.elementStructure, e2)
                         self._generateSubelements(structure.elementStructure, e2)
 
-                        e1.append(e2)
+                        children.append(e2)
+
+            e1.extend(children)
 
 
 """
@@ -832,6 +1162,25 @@ def exportSchemaAsXSD(schema, versionNumber, filePath):
     xsdExporter = XSDExporter()
     xsdExporter.exportSchema(schema, versionNumber, filePath) 
 
+def exportSchemaAsXSDTree(schema, versionNumber):
+    """
+    Exports the given schema as an XSD document, without saving it to a file.
+
+    Parameters
+    ----------
+    schema : Schema
+        The schema to export.
+    versionNumber : string
+        The version number of the schema.
+
+    Returns
+    -------
+    The root element of the XSD document.
+    """
+
+    xsdExporter = XSDExporter()
+    return xsdExporter.exportSchema(schema, versionNumber).getroot()
+
 def exportSchemaAsJSONSchema(schema, versionNumber, filePath):
     """
     Exports the given schema as a JSON Schemas document.
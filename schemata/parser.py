@@ -1,4 +1,5 @@
 import os 
+import sys 
 import logging 
 import re
 from lxml.etree import ElementTree as XMLElementTree, Element as XMLElement, SubElement as XMLSubelement, Comment as XMLComment, QName, indent 
@@ -19,22 +20,11 @@ The parsing is done completely in one step. The parser scans the document and co
 
 
 class Marker(object):
+    __slots__ = ("position",)
+
     def __init__(self):
         self.position = 0
 
-    def copy(self):
-        marker = Marker()
-
-        marker.position = self.position
-
-        return marker
-
-
-def cut(text, startIndex, length=1):
-    a = startIndex
-    b = startIndex + length
-    return text[a:b]
-
 
 class SchemataParsingError(Exception):
     def __init__(self, message):
@@ -46,7 +36,20 @@ class Parser(object):
     _referenceCharacters = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
     _operators = ["=", ">", ">=", "<", "<=", "/="]
     _negatedOperators = ["=", "<", "<=", ">", ">=", "/="]
-    _propertyNames = [
+    # The operator that each operator becomes when the two sides of the comparison are swapped.
+    _negatedOperatorsByOperator = dict(zip(_operators, _negatedOperators))
+    # The operators sorted so that the longest ones are checked first.
+    _operatorsByLength = sorted(_operators, key=len, reverse=True)
+    # The minimum and maximum number of occurrences that each n-expression comparison sets. None means that the 
+    # comparison doesn't set that bound.
+    _comparisonOccurrences = {
+        ">=": lambda n: (n, None),
+        ">": lambda n: (n + 1, None),
+        "<=": lambda n: (None, n),
+        "<": lambda n: (None, n - 1),
+        "=": lambda n: (n, n)
+    }
+    _propertyNames = frozenset([
         "baseType",
         "tagName",
         "allowedPattern",
@@ -61,18 +64,144 @@ class Parser(object):
         "properties",
         "isSelfClosing",
         "lineBreaks"
-    ]
+    ])
+    _formatNamePattern = re.compile(r"Format Name:\s*(.+)\n")
+    _descriptionPattern = re.compile(r"Description:\s*(.+)\n")
+    _exampleValuePattern = re.compile(r"Example Value:\s*(.+)\n")
+    _propertyNamePattern = re.compile("[{}]+".format(re.escape(_propertyNameCharacters)))
+    _referencePattern = re.compile("[{}]+".format(re.escape(_referenceCharacters)))
+    _integerPattern = re.compile("[0-9]+")
+    _whiteSpacePattern = re.compile("[ \t\n]+")
+    _triviaPattern = re.compile(r"[ \t\n]*(/\*.*?\*/[ \t\n]*)?", re.DOTALL)
+
+    # The keywords that begin each kind of structure (apart from root structures), grouped by their first character. 
+    # Each entry is the keyword, the name of the method that parses the structure, and a name used in log messages.
+    _structureKeywords = {
+        "d": [("dataType", "_parseDataStructure", "data")],
+        "a": [("attribute", "_parseAttributeStructure", "attribute"), ("array", "_parseArrayStructure", "array")],
+        "e": [("element", "_parseElementStructure", "element")],
+        "p": [("property", "_parsePropertyStructure", "property")],
+        "o": [("object", "_parseObjectStructure", "object")]
+    }
+
+    # The ways of parsing the value of each property, in the order they should be tried, and a description of the value
+    # that's expected, for error messages.
+    _propertyValueParsers = {
+        "baseType": ([lambda self, t, m, s: self._parseReference(t, m)], "a reference"),
+        "tagName": ([lambda self, t, m, s: self._parseString(t, m)], "a string"),
+        "allowedPattern": ([lambda self, t, m, s: self._parseString(t, m)], "a string"),
+        "allowedValues": ([lambda self, t, m, s: self._parseList(t, m)], "a list of values"),
+        "minimumValue": ([lambda self, t, m, s: self._parseInteger(t, m)], "an integer"),
+        "maximumValue": ([lambda self, t, m, s: self._parseInteger(t, m)], "an integer"),
+        "defaultValue": ([
+            lambda self, t, m, s: self._parseString(t, m),
+            lambda self, t, m, s: self._parseInteger(t, m),
+            lambda self, t, m, s: self._parseBoolean(t, m)
+        ], "a string, integer, or boolean"),
+        "valueType": ([
+            lambda self, t, m, s: self._parseListFunction(t, m, s),
+            lambda self, t, m, s: self._parseReference(t, m)
+        ], "a reference"),
+        "itemType": ([lambda self, t, m, s: self._parseReference(t, m)], "a reference"),
+        "attributes": ([lambda self, t, m, s: self._parseList(t, m, "attributeUsageReference", s)], "an attribute usage reference list"),
+        "properties": ([lambda self, t, m, s: self._parseList(t, m, "propertyUsageReference", s)], "a property usage reference list"),
+        "allowedContent": ([lambda self, t, m, s: self._parseSubelementUsages(t, m, s)], "a structure usage reference or structure list"),
+        "isSelfClosing": ([lambda self, t, m, s: self._parseBoolean(t, m)], "a boolean"),
+        "lineBreaks": ([lambda self, t, m, s: self._parseList(t, m, "integer")], "a list of integers")
+    }
+
+    # The attribute that each property of a structure is stored in, for each kind of structure.
+    _dataStructureProperties = {
+        "baseType": "baseStructureReference",
+        "allowedPattern": "allowedPattern",
+        "allowedValues": "allowedValues",
+        "minimumValue": "minimumValue",
+        "maximumValue": "maximumValue"
+    }
+    _attributeStructureProperties = {
+        "baseType": "baseStructureReference",
+        "tagName": "attributeName",
+        "valueType": "dataStructureReference",
+        "defaultValue": "defaultValue"
+    }
+    _elementStructureProperties = {
+        "baseType": "baseStructureReference",
+        "tagName": "elementName",
+        "attributes": "attributes",
+        "allowedContent": "allowedContent",
+        "isSelfClosing": "isSelfClosing",
+        "lineBreaks": "lineBreaks"
+    }
+    _propertyStructureProperties = {
+        "tagName": "propertyName",
+        "valueType": "valueTypeReference"
+    }
+    _arrayStructureProperties = {
+        "baseType": "baseStructureReference",
+        "itemType": "itemTypeReference"
+    }
+    _objectStructureProperties = {
+        "baseType": "baseStructureReference",
+        "properties": "properties"
+    }
+
+    # The closing bracket for each opening bracket of a subelement list, and the kind of list made by each combination
+    # of opening bracket and separator.
+    _closingBrackets = {
+        "{": "}",
+        "[": "]"
+    }
+    _subelementListTypes = {
+        ("[", ","): OrderedStructureList,
+        ("{", ","): UnorderedStructureList,
+        ("{", "/"): StructureChoice
+    }
+
+    # The methods that parse each kind of 'any' usage reference, keyed by the first letter of the word after '*any '. 
+    # Only 'any elements' and 'any text' usage references can be used as subelement usages.
+    _anyUsageReferenceParsers = {
+        "a": "_parseAnyAttributesUsageReference",
+        "e": "_parseAnyElementsUsageReference",
+        "t": "_parseAnyTextUsageReference",
+        "p": "_parseAnyPropertiesUsageReference"
+    }
+    _anySubelementUsageReferenceParsers = {
+        "e": "_parseAnyElementsUsageReference",
+        "t": "_parseAnyTextUsageReference"
+    }
+
+    # The way of parsing each kind of list item.
+    _listItemParsers = {
+        "string": lambda self, t, m, s: self._parseString(t, m),
+        "integer": lambda self, t, m, s: self._parseInteger(t, m),
+        "boolean": lambda self, t, m, s: self._parseBoolean(t, m),
+        "attributeUsageReference": lambda self, t, m, s: self._parseAttributeUsageReference(t, m, s),
+        "propertyUsageReference": lambda self, t, m, s: self._parsePropertyUsageReference(t, m, s)
+    }
+
+    # The characters that each kind of list item can start with.
+    _listItemFirstCharacters = {
+        "string": "'\"",
+        "integer": "0123456789",
+        "boolean": "tf",
+        "attributeUsageReference": _referenceCharacters,
+        "propertyUsageReference": _referenceCharacters
+    }
 
     def __init__(self):
         pass 
 
     def parseSchemaFromFile(self, filePath):
-        with open(filePath, "r") as fileObject:
-            text = fileObject.read()
+        with open(filePath, "rb") as fileObject:
+            buffer = fileObject.read()
 
-            schema = self.parseSchema(text, filePath)
+        return self.parseSchemaFromBytes(buffer, filePath)
 
-            return schema 
+    def parseSchemaFromBytes(self, buffer, filePath = ""):
+        # Decode the bytes and normalise the line endings, as reading the file in text mode would.
+        text = buffer.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+        return self.parseSchema(text, filePath)
 
     def parseSchema(self, inputText, filePath = ""):
         logger.debug("Attempting to parse schema.")
@@ -87,12 +216,12 @@ class Parser(object):
 
         metadata = self._parseComment(inputText, marker)
 
-        if metadata != None:
+        if metadata is not None:
             logger.debug("Found metadata comment.")
 
-            m = re.search(r"Format Name:\s*(.+)\n", metadata)
+            m = self._formatNamePattern.search(metadata)
 
-            if m != None:
+            if m is not None:
                 schema.formatName = m.group(1).strip()
                 logger.debug(f"Got format name '{schema.formatName}'.")
 
@@ -109,6 +238,7 @@ class Parser(object):
             schema.dependencies.append(s)
 
         schema.structures = self._parseStructures(inputText, marker, schema)
+        schema.invalidateIndex()
 
         for structure in schema.structures:
             if isinstance(structure, ElementStructure) and isinstance(structure.allowedContent, ElementUsageReference):
@@ -123,35 +253,47 @@ class Parser(object):
 
         listDataStructures = []
 
+        # Attributes that use the same list function share one list data structure, keyed by the reference of the data
+        # structure being listed and the separator.
+        listDataStructuresByKey = {}
+
         for structure in schema.structures:
             if isinstance(structure, AttributeStructure) and isinstance(structure.dataStructureReference, ListFunction):
                 lf = structure.dataStructureReference
-                ds1 = lf.dataStructure
-                ds1.setIsUsed()
+                key = (lf.dataStructureReference, lf.separator)
 
-                pattern = ""
+                ds2 = listDataStructuresByKey.get(key)
 
-                if ds1.allowedValues:
-                    pattern = "|".join(ds1.allowedValues)
-                elif ds1.allowedPattern != "":
-                    pattern = ds1.allowedPattern
+                if ds2 is None:
+                    ds1 = lf.dataStructure
+                    ds1.setIsUsed()
 
-                ds2 = DataStructure()
-                ds2.schema = schema
-                ds2.reference = f"list_of__{ds1.reference}"
-                ds2.baseStructureReference = "string"
-                ds2.allowedPattern = "({})(\s*{}\s*({}))*".format(pattern, lf.separator, pattern)
+                    pattern = ""
 
-                logger.debug("Creating list structure '{}'.".format(ds2.reference))
+                    if ds1.allowedValues:
+                        pattern = "|".join(ds1.allowedValues)
+                    elif ds1.allowedPattern != "":
+                        pattern = ds1.allowedPattern
 
-                structure.dataStructureReference = ds2.reference 
+                    ds2 = DataStructure()
+                    ds2.schema = schema
+                    ds2.reference = f"list_of__{ds1.reference}"
+                    ds2.baseStructureReference = "string"
+                    ds2.allowedPattern = "({})(\s*{}\s*({}))*".format(pattern, lf.separator, pattern)
+
+                    logger.debug("Creating list structure '{}'.".format(ds2.reference))
 
-                listDataStructures.append(ds2)
+                    listDataStructuresByKey[key] = ds2
+                    listDataStructures.append(ds2)
+
+                structure.dataStructureReference = ds2.reference 
 
         logger.debug(f"Created {len(listDataStructures)} list data structures.")
 
         schema.structures += listDataStructures 
+        schema.invalidateIndex()
 
+        schema.resolveReferences()
         schema.setIsUsed()
 
         logger.debug("Schema structures: {}".format(", ".join([str(structure) for structure in schema.structures])))
@@ -164,11 +306,12 @@ class Parser(object):
         self._parseWhiteSpace(inputText, marker)
 
         importStatements = []
+        length = len(inputText)
 
-        while marker.position < len(inputText):
+        while marker.position < length:
             i = self._parseImportStatement(inputText, marker, schema)
 
-            if i != None:
+            if i is not None:
                 importStatements.append(i) 
             else:
                 break
@@ -182,14 +325,14 @@ class Parser(object):
 
         self._parseWhiteSpace(inputText, marker)
 
-        if cut(inputText, marker.position, 6) == "import":
+        if inputText.startswith("import", marker.position):
             marker.position += 6
 
             self._parseWhiteSpace(inputText, marker)
 
             path = self._parseString(inputText, marker)
 
-            if path == None or path == "":
+            if path is None or path == "":
                 raise SchemataParsingError(f"Expected a path string at {marker.position}.")
 
             logger.debug(f"Found path '{path}'.")
@@ -202,20 +345,22 @@ class Parser(object):
         logger.debug("Attempting to parse structures.")
 
         structures = []
-        references = []
+        references = set()
+        length = len(inputText)
+        skipTrivia = self._skipTrivia
+        parseStructure = self._parseStructure
 
-        while marker.position < len(inputText):
-            self._parseWhiteSpace(inputText, marker)
-            self._parseComment(inputText, marker)
+        while marker.position < length:
+            skipTrivia(inputText, marker)
             
-            structure = self._parseStructure(inputText, marker, schema)
+            structure = parseStructure(inputText, marker, schema)
 
-            if structure != None:
+            if structure is not None:
                 if structure.reference in references:
                     raise SchemataParsingError(f"A structure with the reference '{structure.reference}' has already been defined.")
 
                 structures.append(structure)
-                references.append(structure.reference)
+                references.add(structure.reference)
 
         logger.debug(f"Found {len(structures)} structures.")
 
@@ -226,30 +371,20 @@ class Parser(object):
 
         self._parseWhiteSpace(inputText, marker)
 
-        if cut(inputText, marker.position, 8) == "dataType":
-            marker.position += 8
+        position = marker.position
 
-            logger.debug("Found data structure.")
-
-            dataStructure = self._parseDataStructure(inputText, marker, schema)
-
-            return dataStructure 
-
-        if cut(inputText, marker.position, 9) == "attribute":
-            marker.position += 9
-
-            logger.debug("Found attribute structure.")
-
-            attributeStructure = self._parseAttributeStructure(inputText, marker, schema)
+        if position >= len(inputText):
+            return None 
 
-            return attributeStructure 
+        # Only the keywords that start with the current character need to be checked.
+        c = inputText[position]
 
-        if cut(inputText, marker.position, 4) == "root":
+        if c == "r" and inputText.startswith("root", position):
             marker.position += 4 
 
             self._parseWhiteSpace(inputText, marker)
 
-            if cut(inputText, marker.position, 7) == "element":
+            if inputText.startswith("element", marker.position):
                 marker.position += 7
 
                 logger.debug("Found root element structure.")
@@ -258,7 +393,7 @@ class Parser(object):
                 elementStructure.canBeRootElement = True 
 
                 return elementStructure 
-            elif cut(inputText, marker.position, 6) == "object":
+            elif inputText.startswith("object", marker.position):
                 marker.position += 6
 
                 logger.debug("Found root object structure.")
@@ -270,46 +405,19 @@ class Parser(object):
             else:
                 raise SchemataParsingError(f"Expected 'element' keyword at position {marker.position}.")
 
-        if cut(inputText, marker.position, 7) == "element":
-            marker.position += 7
-
-            logger.debug("Found element structure.")
-
-            elementStructure = self._parseElementStructure(inputText, marker, schema)
-
-            return elementStructure 
-
-        if cut(inputText, marker.position, 8) == "property":
-            marker.position += 8
-
-            logger.debug("Found property structure.")
-
-            propertyStructure = self._parsePropertyStructure(inputText, marker, schema)
-
-            return propertyStructure 
+        for keyword, methodName, structureName in Parser._structureKeywords.get(c, ()):
+            if inputText.startswith(keyword, position):
+                marker.position += len(keyword)
 
-        if cut(inputText, marker.position, 5) == "array":
-            marker.position += 5
-
-            logger.debug("Found array structure.")
-
-            arrayStructure = self._parseArrayStructure(inputText, marker, schema)
-
-            return arrayStructure 
-
-        if cut(inputText, marker.position, 6) == "object":
-            marker.position += 6
-
-            logger.debug("Found object structure.")
+                logger.debug(f"Found {structureName} structure.")
 
-            objectStructure = self._parseObjectStructure(inputText, marker, schema)
-
-            return objectStructure 
+                return getattr(self, methodName)(inputText, marker, schema)
 
         return None
 
-    def _parseDataStructure(self, inputText, marker, schema = None):
-        """ Gets any data structure at the current position and returns it.
+    def _parseStructureBody(self, inputText, marker, schema, structure, propertyAttributes):
+        """ Gets the reference, metadata, and properties of a structure at the current position, and sets them on the 
+        given structure. The part of the structure definition that's parsed here is the same for every kind of structure.
 
         Parameters
         ----------
@@ -319,20 +427,23 @@ class Parser(object):
             A marker denoting the position at which to start parsing
         schema : Schema
             The schema object being created
+        structure : Structure
+            The new structure to set the values on
+        propertyAttributes : dict
+            The attribute of the structure that each property is stored in
         """
 
-        dataStructure = DataStructure()
-        dataStructure.schema = schema 
+        structure.schema = schema 
 
         # Get the reference.
-        self._parseWhiteSpace(inputText, marker)        
+        self._parseWhiteSpace(inputText, marker)
         reference = self._parseReference(inputText, marker)
         self._parseWhiteSpace(inputText, marker)
 
-        dataStructure.reference = reference 
+        structure.reference = reference 
 
         # Expect the opening bracket.
-        if cut(inputText, marker.position, 1) == "{":
+        if inputText.startswith("{", marker.position):
             marker.position += 1
         else:
             raise SchemataParsingError("Expected '{{' at position {}.".format(marker.position))
@@ -342,48 +453,38 @@ class Parser(object):
         # Get the metadata.
         metadata = self._parseComment(inputText, marker)
 
-        if metadata != None:
-            m1 = re.search(r"Description:\s*(.+)\n", metadata)
-            m2 = re.search(r"Example Value:\s*(.+)\n", metadata)
+        if metadata is not None:
+            m1 = self._descriptionPattern.search(metadata)
+            m2 = self._exampleValuePattern.search(metadata)
 
-            if m1 != None:
-                dataStructure.metadata.description = m1.group(1).strip()
+            if m1 is not None:
+                structure.getOrCreateMetadata().description = m1.group(1).strip()
 
-            if m2 != None:
-                dataStructure.metadata.exampleValue = m2.group(1).strip()
+            if m2 is not None:
+                structure.getOrCreateMetadata().exampleValue = m2.group(1).strip()
 
         self._parseWhiteSpace(inputText, marker) 
 
-        # Step through the text looking for properties.
-        while marker.position < len(inputText):
-            p = self._parseProperty(inputText, marker, schema)
+        length = len(inputText)
+        parseProperty = self._parseProperty
 
-            if p == None:
+        # Step through the text looking for properties.
+        while marker.position < length:
+            if not parseProperty(inputText, marker, schema, structure, propertyAttributes):
                 break
-            else:
-                if p[0] == "baseType":
-                    dataStructure.baseStructureReference = p[1]
-                if p[0] == "allowedPattern":
-                    dataStructure.allowedPattern = p[1]
-                if p[0] == "allowedValues":
-                    dataStructure.allowedValues = p[1] 
-                if p[0] == "minimumValue":
-                    dataStructure.minimumValue = p[1]
-                if p[0] == "maximumValue":
-                    dataStructure.maximumValue = p[1]
 
         self._parseWhiteSpace(inputText, marker)
 
         # Expect the closing bracket.
-        if cut(inputText, marker.position, 1) == "}":
+        if inputText.startswith("}", marker.position):
             marker.position += 1
         else:
             raise SchemataParsingError("Expected '}}' at position {}.".format(marker.position))
 
-        return dataStructure
+        return structure
 
-    def _parseAttributeStructure(self, inputText, marker, schema = None):
-        """ Gets any attribute structure at the current position and returns it.
+    def _parseDataStructure(self, inputText, marker, schema = None):
+        """ Gets any data structure at the current position and returns it.
 
         Parameters
         ----------
@@ -395,62 +496,24 @@ class Parser(object):
             The schema object being created
         """
 
-        attributeStructure = AttributeStructure()
-        attributeStructure.schema = schema
-
-        # Get the reference.
-        self._parseWhiteSpace(inputText, marker)
-        reference = self._parseReference(inputText, marker)
-        self._parseWhiteSpace(inputText, marker)
-
-        attributeStructure.reference = reference 
-
-        # Expect the opening bracket.
-        if cut(inputText, marker.position, 1) == "{":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '{{' at position {}.".format(marker.position))
-
-        self._parseWhiteSpace(inputText, marker) 
-
-        # Get the metadata.
-        metadata = self._parseComment(inputText, marker)
-
-        if metadata != None:
-            m1 = re.search(r"Description:\s*(.+)\n", metadata)
-            m2 = re.search(r"Example Value:\s*(.+)\n", metadata)
-
-            if m1 != None:
-                attributeStructure.metadata.description = m1.group(1).strip()
+        dataStructure = self._parseStructureBody(inputText, marker, schema, DataStructure(), Parser._dataStructureProperties)
 
-            if m2 != None:
-                attributeStructure.metadata.exampleValue = m2.group(1).strip()
-
-        self._parseWhiteSpace(inputText, marker) 
+        return dataStructure 
 
-        # Step through the text looking for properties.
-        while marker.position < len(inputText):
-            p = self._parseProperty(inputText, marker, schema)
-
-            if p == None:
-                break
-            else:
-                if p[0] == "baseType":
-                    attributeStructure.baseStructureReference = p[1]
-                if p[0] == "tagName":
-                    attributeStructure.attributeName = p[1]
-                if p[0] == "valueType":
-                    attributeStructure.dataStructureReference = p[1]
-                if p[0] == "defaultValue":
-                    attributeStructure.defaultValue = p[1]
+    def _parseAttributeStructure(self, inputText, marker, schema = None):
+        """ Gets any attribute structure at the current position and returns it.
 
-        self._parseWhiteSpace(inputText, marker)
+        Parameters
+        ----------
+        inputText : str
+            The text being parsed
+        marker : Marker
+            A marker denoting the position at which to start parsing
+        schema : Schema
+            The schema object being created
+        """
 
-        # Expect the closing bracket.
-        if cut(inputText, marker.position, 1) == "}":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '}}' at position {}.".format(marker.position))
+        attributeStructure = self._parseStructureBody(inputText, marker, schema, AttributeStructure(), Parser._attributeStructureProperties)
 
         # If the attribute name has not been set explicitly, use the attribute structure reference.
         # This allows .schema files to be terse.
@@ -472,66 +535,7 @@ class Parser(object):
             The schema object being created
         """
 
-        elementStructure = ElementStructure()
-        elementStructure.schema = schema 
-
-        # Get the reference.
-        self._parseWhiteSpace(inputText, marker)
-        reference = self._parseReference(inputText, marker)
-        self._parseWhiteSpace(inputText, marker)
-
-        elementStructure.reference = reference 
-
-        # Expect the opening bracket.
-        if cut(inputText, marker.position, 1) == "{":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '{{' at position {}.".format(marker.position))
-
-        self._parseWhiteSpace(inputText, marker)
-
-        # Get the metadata.
-        metadata = self._parseComment(inputText, marker)
-
-        if metadata != None:
-            m1 = re.search(r"Description:\s*(.+)\n", metadata)
-            m2 = re.search(r"Example Value:\s*(.+)\n", metadata)
-
-            if m1 != None:
-                elementStructure.metadata.description = m1.group(1).strip()
-
-            if m2 != None:
-                elementStructure.metadata.exampleValue = m2.group(1).strip()
-
-        self._parseWhiteSpace(inputText, marker) 
-
-        # Step through the text looking for properties.
-        while marker.position < len(inputText):
-            p = self._parseProperty(inputText, marker, schema)
-
-            if p == None:
-                break
-            else:
-                if p[0] == "baseType":
-                    elementStructure.baseStructureReference = p[1]
-                if p[0] == "tagName":
-                    elementStructure.elementName = p[1]
-                if p[0] == "attributes":
-                    elementStructure.attributes = p[1]
-                if p[0] == "allowedContent":
-                    elementStructure.allowedContent = p[1]
-                if p[0] == "isSelfClosing":
-                    elementStructure.isSelfClosing = p[1]
-                if p[0] == "lineBreaks":
-                    elementStructure.lineBreaks = p[1]
-
-        self._parseWhiteSpace(inputText, marker)
-
-        # Expect the closing bracket.
-        if cut(inputText, marker.position, 1) == "}":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '}}' at position {}.".format(marker.position))
+        elementStructure = self._parseStructureBody(inputText, marker, schema, ElementStructure(), Parser._elementStructureProperties)
 
         # If the element name has not been set explicitly, use the element structure reference.
         # This allows .schema files to be terse.
@@ -553,58 +557,7 @@ class Parser(object):
             The schema object being created
         """
 
-        propertyStructure = PropertyStructure()
-        propertyStructure.schema = schema
-
-        # Get the reference.
-        self._parseWhiteSpace(inputText, marker)
-        reference = self._parseReference(inputText, marker)
-        self._parseWhiteSpace(inputText, marker)
-
-        propertyStructure.reference = reference 
-
-        # Expect the opening bracket.
-        if cut(inputText, marker.position, 1) == "{":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '{{' at position {}.".format(marker.position))
-
-        self._parseWhiteSpace(inputText, marker) 
-
-        # Get the metadata.
-        metadata = self._parseComment(inputText, marker)
-
-        if metadata != None:
-            m1 = re.search(r"Description:\s*(.+)\n", metadata)
-            m2 = re.search(r"Example Value:\s*(.+)\n", metadata)
-
-            if m1 != None:
-                propertyStructure.metadata.description = m1.group(1).strip()
-
-            if m2 != None:
-                propertyStructure.metadata.exampleValue = m2.group(1).strip()
-
-        self._parseWhiteSpace(inputText, marker) 
-
-        # Step through the text looking for properties.
-        while marker.position < len(inputText):
-            p = self._parseProperty(inputText, marker, schema)
-
-            if p == None:
-                break
-            else:
-                if p[0] == "tagName":
-                    propertyStructure.propertyName = p[1]
-                if p[0] == "valueType":
-                    propertyStructure.valueTypeReference = p[1]
-
-        self._parseWhiteSpace(inputText, marker)
-
-        # Expect the closing bracket.
-        if cut(inputText, marker.position, 1) == "}":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '}}' at position {}.".format(marker.position))
+        propertyStructure = self._parseStructureBody(inputText, marker, schema, PropertyStructure(), Parser._propertyStructureProperties)
 
         # If the property name has not been set explicitly, use the property structure reference.
         # This allows .schema files to be terse.
@@ -626,58 +579,7 @@ class Parser(object):
             The schema object being created
         """
 
-        arrayStructure = ArrayStructure()
-        arrayStructure.schema = schema 
-
-        # Get the reference.
-        self._parseWhiteSpace(inputText, marker)
-        reference = self._parseReference(inputText, marker)
-        self._parseWhiteSpace(inputText, marker)
-
-        arrayStructure.reference = reference 
-
-        # Expect the opening bracket.
-        if cut(inputText, marker.position, 1) == "{":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '{{' at position {}.".format(marker.position))
-
-        self._parseWhiteSpace(inputText, marker)
-
-        # Get the metadata.
-        metadata = self._parseComment(inputText, marker)
-
-        if metadata != None:
-            m1 = re.search(r"Description:\s*(.+)\n", metadata)
-            m2 = re.search(r"Example Value:\s*(.+)\n", metadata)
-
-            if m1 != None:
-                arrayStructure.metadata.description = m1.group(1).strip()
-
-            if m2 != None:
-                arrayStructure.metadata.exampleValue = m2.group(1).strip()
-
-        self._parseWhiteSpace(inputText, marker) 
-
-        # Step through the text looking for properties.
-        while marker.position < len(inputText):
-            p = self._parseProperty(inputText, marker, schema)
-
-            if p == None:
-                break
-            else:
-                if p[0] == "baseType":
-                    arrayStructure.baseStructureReference = p[1]
-                if p[0] == "itemType":
-                    arrayStructure.itemTypeReference = p[1]
-
-        self._parseWhiteSpace(inputText, marker)
-
-        # Expect the closing bracket.
-        if cut(inputText, marker.position, 1) == "}":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '}}' at position {}.".format(marker.position))
+        arrayStructure = self._parseStructureBody(inputText, marker, schema, ArrayStructure(), Parser._arrayStructureProperties)
 
         return arrayStructure 
 
@@ -694,63 +596,13 @@ class Parser(object):
             The schema object being created
         """
 
-        objectStructure = ObjectStructure()
-        objectStructure.schema = schema 
-
-        # Get the reference.
-        self._parseWhiteSpace(inputText, marker)
-        reference = self._parseReference(inputText, marker)
-        self._parseWhiteSpace(inputText, marker)
-
-        objectStructure.reference = reference 
-
-        # Expect the opening bracket.
-        if cut(inputText, marker.position, 1) == "{":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '{{' at position {}.".format(marker.position))
-
-        self._parseWhiteSpace(inputText, marker)
-
-        # Get the metadata.
-        metadata = self._parseComment(inputText, marker)
-
-        if metadata != None:
-            m1 = re.search(r"Description:\s*(.+)\n", metadata)
-            m2 = re.search(r"Example Value:\s*(.+)\n", metadata)
-
-            if m1 != None:
-                objectStructure.metadata.description = m1.group(1).strip()
-
-            if m2 != None:
-                objectStructure.metadata.exampleValue = m2.group(1).strip()
-
-        self._parseWhiteSpace(inputText, marker) 
-
-        # Step through the text looking for properties.
-        while marker.position < len(inputText):
-            p = self._parseProperty(inputText, marker, schema)
-
-            if p == None:
-                break
-            else:
-                if p[0] == "baseType":
-                    objectStructure.baseStructureReference = p[1]
-                if p[0] == "properties":
-                    objectStructure.properties = p[1]
-
-        self._parseWhiteSpace(inputText, marker)
-
-        # Expect the closing bracket.
-        if cut(inputText, marker.position, 1) == "}":
-            marker.position += 1
-        else:
-            raise SchemataParsingError("Expected '}}' at position {}.".format(marker.position))
+        objectStructure = self._parseStructureBody(inputText, marker, schema, ObjectStructure(), Parser._objectStructureProperties)
 
         return objectStructure 
 
-    def _parseProperty(self, inputText, marker, schema = None):
-        """ Gets any property at the current position and returns it.
+    def _parseProperty(self, inputText, marker, schema, structure, propertyAttributes):
+        """ Gets any property at the current position, sets its value on the given structure, and returns whether a 
+        property was found.
 
         Parameters
         ----------
@@ -760,6 +612,10 @@ class Parser(object):
             A marker denoting the position at which to start parsing
         schema : Schema
             The schema object being created
+        structure : Structure
+            The structure to set the property value on
+        propertyAttributes : dict
+            The attribute of the structure that each property is stored in
         """
 
         logger.debug("Attempting to parse structure property.")
@@ -769,9 +625,9 @@ class Parser(object):
         # Get the property name.
         propertyName = self._parsePropertyName(inputText, marker)
 
-        # If there is no property name, there is no property, so return None.
-        if propertyName == None:
-            return None 
+        # If there is no property name, there is no property, so return False.
+        if propertyName is None:
+            return False 
 
         logger.debug(f"Found property name '{propertyName}'.")
 
@@ -782,124 +638,45 @@ class Parser(object):
         self._parseWhiteSpace(inputText, marker)
 
         # A colon must follow for it to be a property.
-        if cut(inputText, marker.position) == ":":
+        if inputText.startswith(":", marker.position):
             marker.position += 1
         else:
-            return None 
+            return False 
 
         self._parseWhiteSpace(inputText, marker)
         
         propertyValue = None 
 
-        # Get the property value. If the type of the property value is wrong, raise an exception.
-
-        if propertyName == "baseType":
-            propertyValue = self._parseReference(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a reference for property '{propertyName}'.")
-
-        if propertyName == "tagName":
-            propertyValue = self._parseString(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a string for property '{propertyName}'.")
-
-        if propertyName == "allowedPattern":
-            propertyValue = self._parseString(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a string for property '{propertyName}'.")
-        
-        if propertyName == "allowedValues":
-            propertyValue = self._parseList(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a list of values for property '{propertyName}'.")
-
-        if propertyName == "minimumValue":
-            propertyValue = self._parseInteger(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected an integer for property '{propertyName}'.")
-
-        if propertyName == "maximumValue":
-            propertyValue = self._parseInteger(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected an integer for property '{propertyName}'.")
-
-        if propertyName == "defaultValue":
-            propertyValue = self._parseString(inputText, marker)
-
-            if propertyValue == None:
-                propertyValue = self._parseInteger(inputText, marker)
-
-            if propertyValue == None:
-                propertyValue = self._parseBoolean(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a string, integer, or boolean for property '{propertyName}'.")
-        
-        if propertyName == "valueType":
-            propertyValue = self._parseListFunction(inputText, marker, schema)
-
-            if propertyValue == None:
-                propertyValue = self._parseReference(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a reference for property '{propertyName}'.")
-        
-        if propertyName == "itemType":
-            propertyValue = self._parseReference(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a reference for property '{propertyName}'.")
-
-        if propertyName == "attributes":
-            propertyValue = self._parseList(inputText, marker, "attributeUsageReference", schema)
+        # Get the property value. Each way of parsing a value for this property is tried in turn. If none of them find a 
+        # value, the type of the property value is wrong, so raise an exception.
+        valueParsers, expectedValue = Parser._propertyValueParsers[propertyName]
 
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected an attribute usage reference list for property '{propertyName}'.")
+        for valueParser in valueParsers:
+            propertyValue = valueParser(self, inputText, marker, schema)
 
-        if propertyName == "properties":
-            propertyValue = self._parseList(inputText, marker, "propertyUsageReference", schema)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a property usage reference list for property '{propertyName}'.")
-
-        if propertyName == "allowedContent":
-            propertyValue = self._parseSubelementUsages(inputText, marker, schema)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a structure usage reference or structure list for property '{propertyName}'.")
-
-        if propertyName == "isSelfClosing":
-            propertyValue = self._parseBoolean(inputText, marker)
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a boolean for property '{propertyName}'.")
-
-        if propertyName == "lineBreaks":
-            propertyValue = self._parseList(inputText, marker, "integer")
-
-            if propertyValue == None:
-                raise SchemataParsingError(f"Expected a list of integers for property '{propertyName}'.")
+            if propertyValue is not None:
+                break 
 
-        if propertyValue == None:
-            raise SchemataParsingError(f"Expected a value for property '{propertyName}'.")
+        if propertyValue is None:
+            raise SchemataParsingError(f"Expected {expectedValue} for property '{propertyName}'.")
 
         self._parseWhiteSpace(inputText, marker)
 
         logger.debug("Found property value '{}'.".format(propertyValue))
 
         # Expect semi-colon.
-        if cut(inputText, marker.position) == ";":
+        if inputText.startswith(";", marker.position):
             marker.position += 1
         else:
             raise SchemataParsingError(f"Expected ';' at position {marker.position}.")
 
-        return (propertyName, propertyValue)  
+        # Properties that don't apply to this kind of structure are ignored.
+        attributeName = propertyAttributes.get(propertyName)
+
+        if attributeName is not None:
+            setattr(structure, attributeName, propertyValue)
+
+        return True 
 
     def _parseListFunction(self, inputText, marker, schema = None):
         """ Gets any list function at the current position and returns it.
@@ -923,7 +700,7 @@ class Parser(object):
         self._parseWhiteSpace(inputText, marker)
 
         # List functions must start with 'list'.
-        if cut(inputText, marker.position, 4) == "list":
+        if inputText.startswith("list", marker.position):
             marker.position += 4
         else:
             return None 
@@ -931,7 +708,7 @@ class Parser(object):
         self._parseWhiteSpace(inputText, marker)
 
         # Expect the opening bracket.
-        if cut(inputText, marker.position, 1) == "(":
+        if inputText.startswith("(", marker.position):
             marker.position += 1
         else:
             raise SchemataParsingError(f"Expected '(' at position {marker.position}.")
@@ -941,13 +718,13 @@ class Parser(object):
         # Expect a reference.
         reference = self._parseReference(inputText, marker)
 
-        if reference == None:
+        if reference is None:
             raise SchemataParsingError(f"Expected a reference at position {marker.position}.")
 
         self._parseWhiteSpace(inputText, marker)
 
         # Expect a comma.
-        if cut(inputText, marker.position, 1) == ",":
+        if inputText.startswith(",", marker.position):
             marker.position += 1
         else:
             raise SchemataParsingError(f"Expected ',' at position {marker.position}.")
@@ -957,13 +734,13 @@ class Parser(object):
         # Expect a string that denotes the separator.
         separator = self._parseString(inputText, marker)
 
-        if separator == None:
+        if separator is None:
             raise SchemataParsingError(f"Expected a string at position {marker.position}.")
 
         self._parseWhiteSpace(inputText, marker)
 
         # Expect the closing bracket.
-        if cut(inputText, marker.position, 1) == ")":
+        if inputText.startswith(")", marker.position):
             marker.position += 1
         else:
             raise SchemataParsingError(f"Expected ')' at position {marker.position}.")
@@ -991,35 +768,32 @@ class Parser(object):
             The schema object being created
         """
 
-        # Look for the different things that can be subelement usages, and return if found.
-
-        item = self._parseElementUsageReference(inputText, marker, schema)
-
-        if item != None:
-            return item 
-
-        logger.debug("Didn't find element usage reference.")
+        # Each kind of subelement usage can be told apart by its first character, so only try the one that can match 
+        # rather than trying each in turn. None of them backtracks over more than leading white space, so there is 
+        # nothing to be gained by memoising failed attempts.
+        self._parseWhiteSpace(inputText, marker)
 
-        item = self._parseAnyElementsUsageReference(inputText, marker, schema)
+        c = inputText[marker.position:marker.position + 1]
 
-        if item != None:
-            return item 
+        if c == "*":
+            item = self._parseAnyUsageReference(inputText, marker, schema, Parser._anySubelementUsageReferenceParsers)
 
-        logger.debug("Didn't find any elements usage reference.")
+            if item is not None:
+                return item 
 
-        item = self._parseAnyTextUsageReference(inputText, marker, schema)
+            logger.debug("Didn't find any elements or any text usage reference.")
 
-        if item != None:
-            return item 
+            return None 
 
-        logger.debug("Didn't find any text usage reference.")
+        if c != "" and c in Parser._referenceCharacters:
+            return self._parseElementUsageReference(inputText, marker, schema)
 
         item = self._parseSubelementList(inputText, marker, schema)
 
-        if item != None:
+        if item is not None:
             return item 
 
-        logging.debug("Didn't find subelement list.")
+        logger.debug("Didn't find subelement list.")
 
         return None 
 
@@ -1038,121 +812,97 @@ class Parser(object):
 
         logger.debug("Attempting to parse a subelement list.")
 
-        # Copy the marker, as we're going to use other functions that will edit the marker.
-        m = marker.copy()
+        # Remember where the list starts, so that the marker can be put back if there turns out to be no list here.
+        start = marker.position
 
-        self._parseWhiteSpace(inputText, m)
-        self._parseComment(inputText, m)
-        self._parseWhiteSpace(inputText, m)
+        self._skipTrivia(inputText, marker)
 
-        # The bracket type and the separator type determine what kind of list this is.
-        bracketType = ""
-        separatorType = "comma"
+        # The bracket and the separator determine what kind of list this is.
+        bracket = inputText[marker.position:marker.position + 1]
+        separator = ","
 
-        if cut(inputText, m.position) == "{":
-            bracketType = "recurve"
-            m.position += 1
-        elif cut(inputText, m.position) == "[":
-            bracketType = "square"
-            m.position += 1
-        else:
+        closingBracket = Parser._closingBrackets.get(bracket)
+
+        if closingBracket is None:
+            marker.position = start
             return None 
 
-        logger.debug(f"Identified bracket type: {bracketType}.")
+        marker.position += 1
+
+        logger.debug(f"Identified bracket: '{bracket}'.")
 
-        self._parseWhiteSpace(inputText, m)
-        self._parseComment(inputText, m)
-        self._parseWhiteSpace(inputText, m)
+        self._skipTrivia(inputText, marker)
 
         items = []
         n = 0
+        length = len(inputText)
+        skipTrivia = self._skipTrivia
+        parseSubelementUsages = self._parseSubelementUsages
 
         # Step through the text looking for list items.
-        while m.position < len(inputText):
-            self._parseWhiteSpace(inputText, m)
-            self._parseComment(inputText, m)
-            self._parseWhiteSpace(inputText, m)
+        while marker.position < length:
+            skipTrivia(inputText, marker)
 
             # There should be a separator character between each list item.
             if n > 0:
-                c = cut(inputText, m.position)
+                c = inputText[marker.position:marker.position + 1]
 
                 # The first separator used sets up what separator to expect for the rest of the list.
                 if n == 1:
                     if c == ",":
-                        separatorType = "comma"
-                        m.position += 1
+                        marker.position += 1
                     elif c == "/":
-                        separatorType = "slash"
-
                         # Slashes can only be used with recurve brackets.
-                        if bracketType == "square":
-                            raise SchemataParsingError(f"Expected ',' at position {m.position}.")
-
-                        m.position += 1
-
-                elif n > 1:
-                    if (separatorType == "comma" and c == ",") or (separatorType == "slash" and c == "/"):
-                        m.position += 1
-                    elif (separatorType == "comma" and c == "/") or (separatorType == "slash" and c == ","):
-                        # If the separator type is not consistent throughout the list, raise an exception.
-                        raise SchemataParsingError(f"Separators must be the same throughout a list (position {m.position}).")
-                    else:
-                        break
+                        if bracket == "[":
+                            raise SchemataParsingError(f"Expected ',' at position {marker.position}.")
+
+                        separator = "/"
+                        marker.position += 1
+
+                elif c == separator:
+                    marker.position += 1
+                elif c == "," or c == "/":
+                    # If the separator is not consistent throughout the list, raise an exception.
+                    raise SchemataParsingError(f"Separators must be the same throughout a list (position {marker.position}).")
+                else:
+                    break
             
-            self._parseWhiteSpace(inputText, m)
-            self._parseComment(inputText, m)
-            self._parseWhiteSpace(inputText, m)
+            skipTrivia(inputText, marker)
 
             # Try to get an item.
-            item = self._parseSubelementUsages(inputText, m, schema)
+            item = parseSubelementUsages(inputText, marker, schema)
 
             # If no item is found, break the loop.
-            if item == None:
+            if item is None:
                 break 
 
             items.append(item)
 
             n += 1
 
-        logger.debug(f"Identified separator type: {separatorType}.")
+        logger.debug(f"Identified separator: '{separator}'.")
         logger.debug(f"List: {items}.")
 
-        self._parseWhiteSpace(inputText, m)
-        self._parseComment(inputText, m)
-        self._parseWhiteSpace(inputText, m)
+        self._skipTrivia(inputText, marker)
 
-        # Check for closing bracket.
-        c = cut(inputText, m.position)
-
-        if bracketType == "recurve" and c == "}":
-            m.position += 1
-        elif bracketType == "square" and c == "]":
-            m.position += 1
+        # Check for the closing bracket. If no closing bracket or the wrong closing bracket is found, raise an exception.
+        if inputText.startswith(closingBracket, marker.position):
+            marker.position += 1
         else:
-            # If no closing bracket or the wrong closing bracket is found, raise an exception.
-            raise SchemataParsingError(f"Expected closing bracket at position {m.position}.")
+            raise SchemataParsingError(f"Expected closing bracket at position {marker.position}.")
 
         # Make the list object.
-        if bracketType == "square" and separatorType == "comma":
-            l = OrderedStructureList()
-            l.schema = schema
-            l.structures = items 
-        elif bracketType == "recurve" and separatorType == "comma":
-            l = UnorderedStructureList()
-            l.schema = schema
-            l.structures = items 
-        elif bracketType == "recurve" and separatorType == "slash":
-            l = StructureChoice()
-            l.schema = schema
-            l.structures = items 
-        else:
+        listType = Parser._subelementListTypes.get((bracket, separator))
+
+        if listType is None:
+            marker.position = start
             return None 
 
-        logger.debug(f"Found subelement list {l}.")
+        l = listType()
+        l.schema = schema
+        l.structures = items 
 
-        # Update the original marker.
-        marker.position = m.position
+        logger.debug(f"Found subelement list {l}.")
 
         return l
 
@@ -1176,35 +926,16 @@ class Parser(object):
         attributeStructureReference = self._parseReference(inputText, marker)
         self._parseWhiteSpace(inputText, marker)
 
-        if attributeStructureReference == None:
+        if attributeStructureReference is None:
             return None 
 
         attributeUsageReference = AttributeUsageReference()
         attributeUsageReference.schema = schema 
         attributeUsageReference.attributeStructureReference = attributeStructureReference 
 
-        # Get the information in brackets, if there is any.
-        if cut(inputText, marker.position) == "(":
-            marker.position += 1
-
-            self._parseWhiteSpace(inputText, marker)
-
-            # Work out if this is an optional attribute.
-            if cut(inputText, marker.position, 8) == "optional":
-                marker.position += 8
-
-                attributeUsageReference.isOptional = True 
-
-                self._parseWhiteSpace(inputText, marker)
-
-                # If there's not a closing bracket, raise an exception. 
-                if cut(inputText, marker.position) == ")":
-                    marker.position += 1
-                else:
-                    raise SchemataParsingError(f"Expected ')' at position {marker.position}.")
-            else:
-                # If there's nothing in the brackets, raise an exception. 
-                raise SchemataParsingError(f"Expected keyword at position {marker.position}.")
+        # Get the information in brackets, if there is any. The only thing allowed in the brackets is the 'optional' keyword.
+        if self._parseParenthesizedTrailer(inputText, marker) is not None:
+            attributeUsageReference.isOptional = True 
 
         return attributeUsageReference 
 
@@ -1231,63 +962,40 @@ class Parser(object):
         elementStructureReference = self._parseReference(inputText, marker)
         self._parseWhiteSpace(inputText, marker)
 
-        if elementStructureReference == None:
+        if elementStructureReference is None:
             return None 
 
         elementUsageReference = ElementUsageReference()
         elementUsageReference.schema = schema 
         elementUsageReference.elementStructureReference = elementStructureReference  
 
-        # Get the information in the brackets, if there is any.
-        if cut(inputText, marker.position) == "(":
-            marker.position += 1
-
-            self._parseWhiteSpace(inputText, marker)
+        # Get the information in the brackets, if there is any. This can be an n-expression or the 'optional' keyword.
+        trailer = self._parseParenthesizedTrailer(inputText, marker, allowNExpression = True)
 
+        if trailer is not None:
             elementUsageReference.minimumNumberOfOccurrences = 0
             elementUsageReference.maximumNumberOfOccurrences = -1
 
-            nExpression = self._parseNExpression(inputText, marker)
-
-            if nExpression != None:
-                elementUsageReference.nExpression = nExpression 
-
-                # If there's not a closing bracket, raise an exception.
-                if cut(inputText, marker.position) == ")":
-                    marker.position += 1
-                else:
-                    raise SchemataParsingError(f"Expected ')' at position {marker.position}.")
+            if trailer == "optional":
+                elementUsageReference.nExpression = [(">=", 0), ("<=", 1)]
+            else:
+                elementUsageReference.nExpression = trailer 
 
-            elif cut(inputText, marker.position, 8) == "optional":
-                marker.position += 8
+        # Apply the n-expression. 
+        if elementUsageReference.nExpression is not None:
+            for operator, n in elementUsageReference.nExpression:
+                occurrences = Parser._comparisonOccurrences.get(operator)
 
-                elementUsageReference.nExpression = [(">=", 0), ("<=", 1)]
+                if occurrences is None:
+                    continue 
 
-                self._parseWhiteSpace(inputText, marker)
+                minimumNumberOfOccurrences, maximumNumberOfOccurrences = occurrences(n)
 
-                # If there's not a closing bracket, raise an exception.
-                if cut(inputText, marker.position) == ")":
-                    marker.position += 1
-                else:
-                    raise SchemataParsingError(f"Expected ')' at position {marker.position}.")
-            else:
-                # If there's nothing in the brackets, raise an exception.
-                raise SchemataParsingError(f"Expected expression or keyword at position {marker.position}.")
+                if minimumNumberOfOccurrences is not None:
+                    elementUsageReference.minimumNumberOfOccurrences = minimumNumberOfOccurrences
 
-        # Apply the n-expression. 
-        if elementUsageReference.nExpression != None:
-            for comparison in elementUsageReference.nExpression:
-                if comparison[0] == ">=":
-                    elementUsageReference.minimumNumberOfOccurrences = comparison[1]
-                if comparison[0] == ">":
-                    elementUsageReference.minimumNumberOfOccurrences = comparison[1] + 1
-                if comparison[0] == "<=":
-                    elementUsageReference.maximumNumberOfOccurrences = comparison[1]
-                if comparison[0] == "<":
-                    elementUsageReference.maximumNumberOfOccurrences = comparison[1] - 1
-                if comparison[0] == "=":
-                    elementUsageReference.minimumNumberOfOccurrences = comparison[1]
-                    elementUsageReference.maximumNumberOfOccurrences = comparison[1]
+                if maximumNumberOfOccurrences is not None:
+                    elementUsageReference.maximumNumberOfOccurrences = maximumNumberOfOccurrences
 
         return elementUsageReference 
 
@@ -1311,37 +1019,97 @@ class Parser(object):
         propertyStructureReference = self._parseReference(inputText, marker)
         self._parseWhiteSpace(inputText, marker)
 
-        if propertyStructureReference == None:
+        if propertyStructureReference is None:
             return None 
 
         propertyUsageReference = PropertyUsageReference()
         propertyUsageReference.schema = schema 
         propertyUsageReference.propertyStructureReference = propertyStructureReference 
 
-        # Get the information in brackets, if there is any.
-        if cut(inputText, marker.position) == "(":
-            marker.position += 1
+        # Get the information in brackets, if there is any. The only thing allowed in the brackets is the 'optional' keyword.
+        if self._parseParenthesizedTrailer(inputText, marker) is not None:
+            propertyUsageReference.isOptional = True 
 
-            self._parseWhiteSpace(inputText, marker)
+        return propertyUsageReference 
+
+    def _parseParenthesizedTrailer(self, inputText, marker, allowNExpression = False):
+        """ Gets the information in brackets after a usage reference at the current position, if there is any, and returns it.
+
+        The brackets can contain the 'optional' keyword or, if allowed, an n-expression. The keyword is returned as the 
+        string 'optional', and an n-expression is returned as its list of comparisons. If there are no brackets, None is
+        returned.
+
+        Parameters
+        ----------
+        inputText : str
+            The text being parsed
+        marker : Marker
+            A marker denoting the position at which to start parsing
+        allowNExpression : bool
+            Whether an n-expression is allowed in the brackets
+        """
+
+        if not inputText.startswith("(", marker.position):
+            return None 
+
+        marker.position += 1
 
-            # Work out if this is an optional attribute.
-            if cut(inputText, marker.position, 8) == "optional":
+        self._parseWhiteSpace(inputText, marker)
+
+        trailer = None 
+
+        if allowNExpression:
+            trailer = self._parseNExpression(inputText, marker)
+
+        if trailer is None:
+            if inputText.startswith("optional", marker.position):
                 marker.position += 8
 
-                propertyUsageReference.isOptional = True 
+                trailer = "optional"
 
                 self._parseWhiteSpace(inputText, marker)
-
-                # If there's not a closing bracket, raise an exception. 
-                if cut(inputText, marker.position) == ")":
-                    marker.position += 1
-                else:
-                    raise SchemataParsingError(f"Expected ')' at position {marker.position}.")
+            elif allowNExpression:
+                # If there's nothing in the brackets, raise an exception.
+                raise SchemataParsingError(f"Expected expression or keyword at position {marker.position}.")
             else:
-                # If there's nothing in the brackets, raise an exception. 
+                # If there's nothing in the brackets, raise an exception.
                 raise SchemataParsingError(f"Expected keyword at position {marker.position}.")
 
-        return propertyUsageReference 
+        # If there's not a closing bracket, raise an exception.
+        if inputText.startswith(")", marker.position):
+            marker.position += 1
+        else:
+            raise SchemataParsingError(f"Expected ')' at position {marker.position}.")
+
+        return trailer 
+
+    def _parseAnyUsageReference(self, inputText, marker, schema = None, parsers = _anyUsageReferenceParsers):
+        """ Gets any 'any' usage reference (any attributes, any elements, any text, or any properties) at the current position
+        and returns it.
+
+        Parameters
+        ----------
+        inputText : str
+            The text being parsed
+        marker : Marker
+            A marker denoting the position at which to start parsing
+        schema : Schema
+            The schema object being created
+        parsers : dict
+            The methods that parse the kinds of 'any' usage reference that are allowed here, keyed by the first letter of 
+            the word after '*any '
+        """
+
+        if not inputText.startswith("*any ", marker.position):
+            return None 
+
+        # Only the kind of 'any' usage reference that starts with the next letter needs to be checked.
+        methodName = parsers.get(inputText[marker.position + 5:marker.position + 6])
+
+        if methodName is None:
+            return None 
+
+        return getattr(self, methodName)(inputText, marker, schema)
 
     def _parseAnyAttributesUsageReference(self, inputText, marker, schema = None):
         """ Gets an any attributes usage reference at the current position and returns it.
@@ -1356,13 +1124,13 @@ class Parser(object):
             The schema object being created
         """
 
-        if cut(inputText, marker.position, 16) == "*any attributes*":
+        if inputText.startswith("*any attributes*", marker.position):
             marker.position += 16
 
             ur = AnyAttributesUsageReference()
             ur.schema = schema 
 
-            return schema
+            return ur
 
         return None
 
@@ -1379,7 +1147,7 @@ class Parser(object):
             The schema object being created
         """
 
-        if cut(inputText, marker.position, 14) == "*any elements*":
+        if inputText.startswith("*any elements*", marker.position):
             marker.position += 14
 
             ur = AnyElementsUsageReference()
@@ -1402,7 +1170,7 @@ class Parser(object):
             The schema object being created
         """
 
-        if cut(inputText, marker.position, 10) == "*any text*":
+        if inputText.startswith("*any text*", marker.position):
             marker.position += 10
 
             ur = AnyTextUsageReference()
@@ -1425,13 +1193,13 @@ class Parser(object):
             The schema object being created
         """
 
-        if cut(inputText, marker.position, 16) == "*any properties*":
+        if inputText.startswith("*any properties*", marker.position):
             marker.position += 16
 
             ur = AnyPropertiesUsageReference()
             ur.schema = schema 
 
-            return schema
+            return ur
 
         return None
 
@@ -1454,22 +1222,22 @@ class Parser(object):
         o1 = None 
         self._parseWhiteSpace(inputText, marker)
 
-        if n1 != None:
+        if n1 is not None:
             o1 = self._parseOperator(inputText, marker)
 
             # If the expression starts with a number, an operator must follow.
-            if o1 == None:
+            if o1 is None:
                 raise SchemataParsingError(f"Expected an operator at position {marker.position}.")
 
         self._parseWhiteSpace(inputText, marker)
 
         # Check for the variable - 'n'.
-        if cut(inputText, marker.position) == "n":
+        if inputText.startswith("n", marker.position):
             marker.position += 1
         else:
             # If nothing has been found so far, then there is no n-expression, so return None. 
             # If a number and operator have been found, but not an 'n', then the syntax is wrong, so raise an exception.
-            if n1 == None and o1 == None:
+            if n1 is None and o1 is None:
                 return None 
             else:
                 raise SchemataParsingError(f"Expected 'n' at position {marker.position}.")
@@ -1478,26 +1246,20 @@ class Parser(object):
         self._parseWhiteSpace(inputText, marker)
         o2 = self._parseOperator(inputText, marker)
 
-        if o2 == None:
+        if o2 is None:
             raise SchemataParsingError(f"Expected an operator at position {marker.position}.")
 
         self._parseWhiteSpace(inputText, marker)
         n2 = self._parseInteger(inputText, marker)
 
-        if n2 == None:
+        if n2 is None:
             raise SchemataParsingError(f"Expected a number at position {marker.position}.")
 
-        e = []
-
         # Operators before the 'n' must be reversed.
-        if n1 != None and o1 != None:
-            i = self._operators.index(o1)
-            o1b = self._negatedOperators[i]
-            e += [(o1b, n1)]
-
-        e += [(o2, n2)]
+        if n1 is not None and o1 is not None:
+            return [(Parser._negatedOperatorsByOperator[o1], n1), (o2, n2)]
 
-        return e      
+        return [(o2, n2)]      
 
     def _parseList(self, inputText, marker, objectType = "string", schema = None):
         """ Gets any list (of strings, integers, booleans, et cetera) at the current position and returns it.
@@ -1516,42 +1278,43 @@ class Parser(object):
 
         items = []
         n = 0
+        length = len(inputText)
 
-        # Keep trying to find items in the list until you find something that's not a valid list item.
-        while marker.position < len(inputText):
-            self._parseWhiteSpace(inputText, marker)
+        # The type of item is the same for the whole list, so look up how to parse it once.
+        parseItem = Parser._listItemParsers[objectType]
+        firstCharacters = Parser._listItemFirstCharacters[objectType]
 
-            # Expect a comma between each of the items in the list.
-            if n > 0:
-                if cut(inputText, marker.position) == ",":
-                    marker.position += 1
-                else:
-                    break
-            
-            self._parseWhiteSpace(inputText, marker)
+        self._parseWhiteSpace(inputText, marker)
 
-            item = None
+        # Keep trying to find items in the list until you find something that's not a valid list item.
+        while marker.position < length:
+            # If the next character can't start an item of the right type, there are no more items.
+            c = inputText[marker.position:marker.position + 1]
+
+            if c == "" or c not in firstCharacters:
+                break 
 
             # Check to see if the expected object is present.
-            if objectType == "string":
-                item = self._parseString(inputText, marker)
-            if objectType == "integer":
-                item = self._parseInteger(inputText, marker)
-            if objectType == "boolean":
-                item = self._parseBoolean(inputText, marker)
-            if objectType == "attributeUsageReference":
-                item = self._parseAttributeUsageReference(inputText, marker, schema)
-            if objectType == "propertyUsageReference":
-                item = self._parsePropertyUsageReference(inputText, marker, schema)
+            item = parseItem(self, inputText, marker, schema)
 
             # If an item of the right type is not found, break the loop.
-            if item == None:
+            if item is None:
                 break 
 
             items.append(item)
 
             n += 1
 
+            self._parseWhiteSpace(inputText, marker)
+
+            # Expect a comma between each of the items in the list.
+            if inputText.startswith(",", marker.position):
+                marker.position += 1
+            else:
+                break 
+
+            self._parseWhiteSpace(inputText, marker)
+
         # If no items were found, no list was found, so return None.
         if n == 0:
             return None 
@@ -1575,23 +1338,18 @@ class Parser(object):
 
         logger.debug("Attempting to parse property name.")
 
-        t = ""
-
-        # Step through the text and check if the current character is a valid property name character.
-        while marker.position < len(inputText):
-            c = cut(inputText, marker.position)
-
-            # If the current character is a valid property name character, add it to the temporary variable. Otherwise, break the loop.
-            if c in Parser._propertyNameCharacters:
-                t += c
-                marker.position += 1
-            else:
-                break
+        # Match the run of valid property name characters at the current position.
+        m = Parser._propertyNamePattern.match(inputText, marker.position)
 
         # If no property name was found, return None.
-        if len(t) == 0:
+        if m is None:
             return None 
 
+        # Property names are looked up in the property tables for every property of every structure, so intern them 
+        # in the same way as references.
+        t = sys.intern(m.group())
+        marker.position = m.end()
+
         logger.debug(f"Found property name '{t}'.")
 
         return t 
@@ -1607,23 +1365,18 @@ class Parser(object):
             A marker denoting the position at which to start parsing
         """
 
-        t = ""
-
-        # Step through the text to see if each character is a valid reference character.
-        while marker.position < len(inputText):
-            c = cut(inputText, marker.position)
-
-            # If the current character is a valid reference character, add it to the temporary variable. Otherwise, break the loop.
-            if c in Parser._referenceCharacters:
-                t += c
-                marker.position += 1
-            else:
-                break
+        # Match the run of valid reference characters at the current position.
+        m = Parser._referencePattern.match(inputText, marker.position)
 
         # If nothing was found, return None.
-        if len(t) == 0:
+        if m is None:
             return None
 
+        # References are used as dictionary keys and compared many times, so intern them. Every copy of the same 
+        # reference is then the same object, and lookups can match on identity.
+        t = sys.intern(m.group())
+        marker.position = m.end()
+
         logger.debug(f"Found reference '{t}'.")
 
         return t 
@@ -1639,13 +1392,10 @@ class Parser(object):
             A marker denoting the position at which to start parsing
         """
 
-        # Sort the operators so that we check for the longest one first.
-        operators = sorted(self._operators, key= lambda o: len(o), reverse=True)
-
-        # Go through the list of operators.
-        for operator in operators:
+        # Go through the list of operators, longest first.
+        for operator in Parser._operatorsByLength:
             # Check if the operator is at the current position.
-            if cut(inputText, marker.position, len(operator)) == operator:
+            if inputText.startswith(operator, marker.position):
                 marker.position += len(operator)
 
                 return operator
@@ -1664,39 +1414,27 @@ class Parser(object):
             A marker denoting the position at which to start parsing
         """
 
-        t = ""
-        quoteMarkType = ""
-        foundClosingQuoteMark = False
-
         # Strings in .schema files can start with either single or double quote marks. Check to see if the current character is either. 
-        if cut(inputText, marker.position) == "'":
-            quoteMarkType = "single"
-            marker.position += 1
-        elif cut(inputText, marker.position) == "\"":
-            quoteMarkType = "double"
-            marker.position += 1
-        else:
+        quoteMark = inputText[marker.position:marker.position + 1]
+
+        if quoteMark != "'" and quoteMark != "\"":
             # If the current character isn't a single or double quote mark, then there is no string, so return None.
             return None 
 
-        # Step through the text and look for the closing quote mark.
-        while marker.position < len(inputText):
-            c = cut(inputText, marker.position)
+        marker.position += 1
 
-            # If the closing quote mark is found, exit the loop. Otherwise, add the character to the temporary variable.
-            if (quoteMarkType == "single" and c == "'") or (quoteMarkType == "double" and c == "\""):
-                marker.position += 1
-                foundClosingQuoteMark = True
-                break
-            else:
-                t += c
-                marker.position += 1
+        # Look for the closing quote mark. Schemata strings have no escape sequences, so the string is everything up to 
+        # the next quote mark of the same type.
+        end = inputText.find(quoteMark, marker.position)
 
         # If no closing quote mark is found, then the .schema file syntax is wrong, so raise an exception.
-        if not foundClosingQuoteMark:
-            quoteMark = "'" if quoteMarkType == "single" else "\""
+        if end == -1:
+            marker.position = len(inputText)
             raise SchemataParsingError(f"Expected {quoteMark} at position {marker.position}.")
 
+        t = inputText[marker.position:end]
+        marker.position = end + 1
+
         return t 
 
     def _parseInteger(self, inputText, marker):
@@ -1710,24 +1448,16 @@ class Parser(object):
             A marker denoting the position at which to start parsing
         """
 
-        t = ""
-
-        # Step through the text and check if the characters are digits.
-        while marker.position < len(inputText):
-            c = cut(inputText, marker.position)
-
-            if c in "0123456789":
-                t += c 
-                # If the current character is a digit, move the marker along by 1.
-                marker.position += 1
-            else:
-                break 
+        # Match the run of digits at the current position.
+        m = Parser._integerPattern.match(inputText, marker.position)
 
         # If no digits are found, return None.
-        if len(t) == 0:
+        if m is None:
             return None 
 
-        return int(t)
+        marker.position = m.end()
+
+        return int(m.group())
 
     def _parseBoolean(self, inputText, marker):
         """ Gets any boolean at the current position and returns it.
@@ -1741,10 +1471,10 @@ class Parser(object):
         """
 
         # If either 'true' or 'false' is found, return a boolean value.
-        if cut(inputText, marker.position, 4) == "true":
+        if inputText.startswith("true", marker.position):
             marker.position += 4
             return True 
-        elif cut(inputText, marker.position, 5) == "false":
+        elif inputText.startswith("false", marker.position):
             marker.position += 5
             return False 
 
@@ -1763,34 +1493,29 @@ class Parser(object):
         """
 
         # Check for the opening comment token.
-        if cut(inputText, marker.position, 2) == "/*":
+        if inputText.startswith("/*", marker.position):
             marker.position += 2
 
-            t = ""
-            foundClosingTag = False 
-
-            # Step through the text and look for the closing comment token.
-            while marker.position < len(inputText):
-                if cut(inputText, marker.position, 2) == "*/":
-                    marker.position += 2
-                    foundClosingTag = True 
-                    break 
-                else:
-                    # Until the closing comment token is found, add any text to the temporary variable.
-                    t += cut(inputText, marker.position)
-                    marker.position += 1
+            # Look for the closing comment token. Everything up to it is the comment.
+            end = inputText.find("*/", marker.position)
 
             # If no closing comment token is found, raise an exception.
-            if not foundClosingTag:
+            if end == -1:
+                marker.position = len(inputText)
                 raise SchemataParsingError(f"Expected '*/' at position {marker.position}.")
 
+            t = inputText[marker.position:end]
+            marker.position = end + 2
+
             return t
         else:
             # If no comment is found, return None.
             return None 
 
     def _parseWhiteSpace(self, inputText, marker):
-        """ Gets any white space at the current position and returns it.
+        """ Skips any white space at the current position, and returns whether any was found.
+
+        The white space itself is never used, so it isn't returned.
 
         Parameters
         ----------
@@ -1800,21 +1525,34 @@ class Parser(object):
             A marker denoting the position at which to start parsing
         """
 
-        t = ""
+        # Match the run of white space at the current position.
+        m = Parser._whiteSpacePattern.match(inputText, marker.position)
 
-        # Step through the text and check if it is white space.
-        while marker.position < len(inputText):
-            c = cut(inputText, marker.position)
+        # If no white space is found, return False.
+        if m is None:
+            return False
 
-            if c in " \t\n":
-                t += c
-                # If the current character is white space, move the marker along by 1.
-                marker.position += 1
-            else:
-                break
+        marker.position = m.end()
 
-        # If no white space is found, return None.
-        if len(t) == 0:
-            return None
+        return True 
+
+    def _skipTrivia(self, inputText, marker):
+        """ Skips any white space, followed by any comment and the white space after it, at the current position.
+
+        This does the same as calling _parseWhiteSpace, _parseComment, and _parseWhiteSpace in turn, but in a single match.
+
+        Parameters
+        ----------
+        inputText : str
+            The text being parsed
+        marker : Marker
+            A marker denoting the position at which to start parsing
+        """
+
+        m = Parser._triviaPattern.match(inputText, marker.position)
+
+        marker.position = m.end()
 
-        return t 
\ No newline at end of file
+        # If a comment is opened but never closed, raise an exception, as _parseComment would.
+        if m.group(1) is None and inputText.startswith("/*", marker.position):
+            raise SchemataParsingError(f"Expected '*/' at position {len(inputText)}.")
@@ -1,4 +1,5 @@
 import logging 
+import json 
 
 logger = logging.getLogger("schemata.structures")
 
@@ -41,9 +42,74 @@ class Schema(object):
         self.structures = []
         self.dependencies = []
 
+        # The list of all structures, the reference lookup and the structures grouped by kind are built on first use 
+        # and kept until the schema changes. The key records which structure lists they were built from, and how long 
+        # those lists were, so that they're rebuilt if structures or dependencies are added, removed or replaced.
+        self._indexKey = None 
+        self._allStructuresCache = None 
+        self._structureIndex = None 
+        self._structureBuckets = None 
+
+    def _checkIndex(self):
+        # This runs on every lookup, so the common case of a schema with no dependencies is kept cheap.
+        structures = self.structures 
+        key = (id(structures), len(structures))
+
+        if self.dependencies:
+            key += tuple((id(dependency.structures), len(dependency.structures)) for dependency in self.dependencies)
+
+        if key != self._indexKey:
+            self.invalidateIndex()
+            self._indexKey = key 
+
     @property 
     def _allStructures(self):
-        return [structure for dependency in self.dependencies for structure in dependency.structures] + self.structures 
+        self._checkIndex()
+
+        if self._allStructuresCache is None:
+            self._allStructuresCache = [structure for dependency in self.dependencies for structure in dependency.structures] + self.structures 
+
+        return self._allStructuresCache
+
+    def invalidateIndex(self):
+        """
+        Clears the cached list of structures, the reference lookup and the structures grouped by kind. Adding, removing 
+        or replacing structures or dependencies is picked up automatically, but this must be called if a structure in 
+        the schema is swapped for another in place (e.g., schema.structures[0] = structure), or if a structure's 
+        reference is changed.
+
+        Returns
+        -------
+        None
+        """
+
+        self._allStructuresCache = None 
+        self._structureIndex = None 
+        self._structureBuckets = None 
+
+    def _getStructureBuckets(self):
+        """
+        Sorts all of the structures into data, attribute, element and object structures in a single pass.
+
+        Returns
+        -------
+        A dictionary of lists of structures, keyed by structure class.
+        """
+
+        self._checkIndex()
+
+        if self._structureBuckets is None:
+            buckets = {DataStructure: [], AttributeStructure: [], ElementStructure: [], ObjectStructure: []}
+
+            for structure in self._allStructures:
+                for structureClass, bucket in buckets.items():
+                    if isinstance(structure, structureClass):
+                        bucket.append(structure)
+                        break 
+
+            self._structureBuckets = buckets 
+
+        return self._structureBuckets
 
     def getStructureByReference(self, reference):
         """
@@ -57,12 +123,14 @@ class Schema(object):
         Returns
         -------
         Either the structure with the given reference, or None if none is found.
-        
         """
 
-        d = {structure.reference : structure for structure in self._allStructures}
+        self._checkIndex()
+
+        if self._structureIndex is None:
+            self._structureIndex = {structure.reference : structure for structure in self._allStructures}
 
-        return d.get(reference, None)
+        return self._structureIndex.get(reference, None)
 
     def getDataStructures(self):
         """
@@ -73,7 +141,7 @@ class Schema(object):
         A list of data structures.
         """
 
-        return [structure for structure in self._allStructures if isinstance(structure, DataStructure)]
+        return list(self._getStructureBuckets()[DataStructure])
 
     def getAttributeStructures(self):
         """
@@ -84,7 +152,7 @@ class Schema(object):
         A list of attribute structures.
         """
 
-        return [structure for structure in self._allStructures if isinstance(structure, AttributeStructure)]
+        return list(self._getStructureBuckets()[AttributeStructure])
 
     def getElementStructures(self):
         """
@@ -95,7 +163,7 @@ class Schema(object):
         A list of element structures.
         """
 
-        return [structure for structure in self._allStructures if isinstance(structure, ElementStructure)]
+        return list(self._getStructureBuckets()[ElementStructure])
 
     def getRootElementStructures(self):
         """
@@ -106,7 +174,7 @@ class Schema(object):
         A list of element structures.
         """
 
-        return [structure for structure in self.getElementStructures() if structure.canBeRootElement]
+        return [structure for structure in self._getStructureBuckets()[ElementStructure] if structure.canBeRootElement]
 
     def getNonRootElementStructures(self):
         """
@@ -117,7 +185,7 @@ class Schema(object):
         A list of element structures.
         """
 
-        return [structure for structure in self.getElementStructures() if not structure.canBeRootElement]
+        return [structure for structure in self._getStructureBuckets()[ElementStructure] if not structure.canBeRootElement]
 
     def getObjectStructures(self):
         """
@@ -128,7 +196,7 @@ class Schema(object):
         A list of object structures.
         """
 
-        return [structure for structure in self._allStructures if isinstance(structure, ObjectStructure)]
+        return list(self._getStructureBuckets()[ObjectStructure])
 
     def getRootObjectStructures(self):
         """
@@ -139,7 +207,21 @@ class Schema(object):
         A list of object structures.
         """
 
-        return [structure for structure in self.getObjectStructures() if structure.canBeRootObject]
+        return [structure for structure in self._getStructureBuckets()[ObjectStructure] if structure.canBeRootObject]
+
+    def resolveReferences(self):
+        """
+        Looks up the structures that every structure and usage reference in this schema refers to, and stores them on
+        the objects that refer to them, so that they don't need to be looked up again each time they're used. This must be
+        called again if any of the references change.
+
+        Returns
+        -------
+        None 
+        """
+
+        for structure in self.structures:
+            structure.resolveReferences()
 
     def setIsUsed(self):
         """
@@ -167,9 +249,32 @@ class Schema(object):
 
         return {
             "formatName": self.formatName,
-            "structures": [structure.toJSON() if hasattr(structure, "toJSON") else structure for structure in self.structures]
+            "structures": [structure.toJSON() for structure in self.structures]
         }
 
+    def writeJSON(self, fileObject, indent = 2):
+        """
+        Writes this schema to a file as JSON, in the same form as toJSON(). The JSON is written in pieces as it's encoded, 
+        and each structure is only converted to a dictionary when the encoder reaches it, so the dictionary for the whole 
+        schema is never built.
+
+        Parameters
+        ----------
+        fileObject : file
+            A text file object to write the JSON to.
+        indent : int
+            The number of spaces to indent each level by.
+
+        Returns
+        -------
+        None
+        """
+
+        encoder = json.JSONEncoder(indent=indent, ensure_ascii=False, default=lambda o: o.toJSON())
+
+        for chunk in encoder.iterencode({"formatName": self.formatName, "structures": self.structures}):
+            fileObject.write(chunk)
+
 
 class StructureMetadata(object):
     """
@@ -186,6 +291,8 @@ class StructureMetadata(object):
 
     """
 
+    __slots__ = ("description", "exampleValue")
+
     def __init__(self):
         self.description = ""
         self.exampleValue = ""
@@ -205,6 +312,29 @@ class StructureMetadata(object):
         }
 
 
+class _EmptyStructureMetadata(StructureMetadata):
+    """
+    Empty metadata that's shared by every structure that doesn't have any metadata of its own, so that one isn't created 
+    for each structure. It can't be changed - use Structure.getOrCreateMetadata() to get metadata that can be.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        object.__setattr__(self, "description", "")
+        object.__setattr__(self, "exampleValue", "")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("The shared empty metadata can't be changed. Use Structure.getOrCreateMetadata() to get metadata that can be.")
+
+    def __reduce__(self):
+        # Unpickle as the shared instance, rather than as a copy of it.
+        return "_emptyMetadata"
+
+
+_emptyMetadata = _EmptyStructureMetadata()
+
+
 class Structure(object):
     """
     A base class for all structures. Defines common properties.
@@ -226,20 +356,54 @@ class Structure(object):
     metadata : StructureMetadata
         the metadata for this structure 
     """
+
+    __slots__ = ("schema", "baseStructureReference", "_baseStructure", "reference", "isUsed", "metadata")
+
     def __init__(self, reference = ""):
         self.schema = None 
 
         self.baseStructureReference = ""
 
+        self._baseStructure = None 
+
         self.reference = reference
         self.isUsed = False 
 
-        self.metadata = StructureMetadata()
+        self.metadata = _emptyMetadata
 
     @property 
     def baseStructure(self):
+        if self._baseStructure is not None:
+            return self._baseStructure
+
         return self.schema.getStructureByReference(self.baseStructureReference)
 
+    def getOrCreateMetadata(self):
+        """
+        Gets the metadata for this structure so that it can be changed. Structures share one empty metadata object until 
+        they need their own, so this creates it the first time it's needed.
+
+        Returns
+        -------
+        The StructureMetadata for this structure.
+        """
+
+        if self.metadata is _emptyMetadata:
+            self.metadata = StructureMetadata()
+
+        return self.metadata 
+
+    def resolveReferences(self):
+        """
+        Looks up and stores the structures that this structure refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        self._baseStructure = self.schema.getStructureByReference(self.baseStructureReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for this structure and the structures it depends on.
@@ -249,9 +413,14 @@ class Structure(object):
         None 
         """
 
+        # A structure that's already marked as used has already marked everything it depends on. Stopping here also
+        # stops structures that refer to each other from recursing forever.
+        if self.isUsed:
+            return 
+
         self.isUsed = True 
 
-        if self.baseStructure != None:
+        if self.baseStructure is not None:
             self.baseStructure.setIsUsed()
 
     def toJSON(self):
@@ -286,6 +455,8 @@ class DataStructure(Structure):
         the default value that this data structure takes
     """
 
+    __slots__ = ("allowedPattern", "allowedValues", "minimumValue", "maximumValue", "defaultValue")
+
     def __init__(self, reference = ""):
         super().__init__(reference)
 
@@ -340,16 +511,34 @@ class ListFunction(object):
         the character or set of characters that should act as separators in this list - usually a comma or a semi-colon
     """
 
+    __slots__ = ("schema", "dataStructureReference", "_dataStructure", "separator")
+
     def __init__(self, dataStructureReference, separator):
         self.schema = None 
 
         self.dataStructureReference = dataStructureReference 
+
+        self._dataStructure = None 
         self.separator = separator 
 
     @property 
     def dataStructure(self):
+        if self._dataStructure is not None:
+            return self._dataStructure
+
         return self.schema.getStructureByReference(self.dataStructureReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the data structure that this list function refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        self._dataStructure = self.schema.getStructureByReference(self.dataStructureReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for the structure this list function depends on.
@@ -359,7 +548,7 @@ class ListFunction(object):
         None 
         """
 
-        if self.dataStructure != None:
+        if self.dataStructure is not None:
             self.dataStructure.setIsUsed()
 
 
@@ -381,17 +570,36 @@ class AttributeStructure(Structure):
         the default value of this attribute; overrides the default value set by the data structure
     """
 
+    __slots__ = ("attributeName", "dataStructureReference", "_dataStructure", "defaultValue")
+
     def __init__(self, reference = ""):
         super().__init__(reference)
 
         self.attributeName = ""
         self.dataStructureReference = ""
+        self._dataStructure = None 
         self.defaultValue = None 
 
     @property 
     def dataStructure(self):
+        if self._dataStructure is not None:
+            return self._dataStructure
+
         return self.schema.getStructureByReference(self.dataStructureReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structures that this structure refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        super().resolveReferences()
+
+        self._dataStructure = self.schema.getStructureByReference(self.dataStructureReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for this structure and the structures it depends on.
@@ -401,9 +609,12 @@ class AttributeStructure(Structure):
         None 
         """
 
+        if self.isUsed:
+            return 
+
         super().setIsUsed()
 
-        if self.dataStructure != None:
+        if self.dataStructure is not None:
             self.dataStructure.setIsUsed()
 
     def toJSON(self):
@@ -475,6 +686,9 @@ class ElementStructure(Structure):
         whether or not this element is a mixed type - i.e., it can contain a mixture of subelements and 
         any text; common in HTML-like documents; mainly used by the Schemata exporter
     """
+
+    __slots__ = ("elementName", "canBeRootElement", "attributes", "allowedContent", "valueTypeReference", "_valueType", "isSelfClosing", "lineBreaks")
+
     def __init__(self, reference = ""):
         super().__init__(reference)
 
@@ -483,6 +697,7 @@ class ElementStructure(Structure):
         self.attributes = []
         self.allowedContent = None 
         self.valueTypeReference = ""
+        self._valueType = None 
 
         self.isSelfClosing = False 
         self.lineBreaks = [0, 1, 1, 1]
@@ -493,37 +708,42 @@ class ElementStructure(Structure):
 
     @property 
     def hasContent(self):
-        if self.allowedContent == None:
+        if self.allowedContent is None:
             return False 
 
-        if isinstance(self.allowedContent, StructureList) and len(self.allowedContent.structures) == 0:
+        if self.allowedContent._kind == "list" and len(self.allowedContent.structures) == 0:
             return False 
 
         return True 
 
     @property 
     def containsElementUsageReference(self):
-        if isinstance(self.allowedContent, ElementUsageReference):
-            return True 
+        if self.allowedContent is None:
+            return False 
+
+        kind = self.allowedContent._kind
 
-        if isinstance(self.allowedContent, AnyElementsUsageReference):
-            return True
+        if kind == "element" or kind == "anyElements":
+            return True 
 
-        if isinstance(self.allowedContent, StructureList):
+        if kind == "list":
             # To do: this needs to be recursive.
-            if len([structure for structure in self.allowedContent.structures if isinstance(structure, ElementUsageReference) or isinstance(structure, AnyElementsUsageReference) or isinstance(structure, StructureList)]) > 0:
-                return True 
+            return any(structure._kind in _elementContentKinds for structure in self.allowedContent.structures)
 
         return False 
 
     @property 
     def containsAnyTextUsageReference(self):
-        if isinstance(self.allowedContent, AnyTextUsageReference):
+        if self.allowedContent is None:
+            return False 
+
+        kind = self.allowedContent._kind
+
+        if kind == "anyText":
             return True 
 
-        if isinstance(self.allowedContent, StructureList):
-            if len([structure for structure in self.allowedContent.structures if isinstance(structure, AnyTextUsageReference)]) > 0:
-                return True 
+        if kind == "list":
+            return any(structure._kind == "anyText" for structure in self.allowedContent.structures)
 
         return False 
 
@@ -533,7 +753,7 @@ class ElementStructure(Structure):
 
     @property 
     def contentIsSingleValue(self):
-        return isinstance(self.allowedContent, DataUsageReference)
+        return self.allowedContent is not None and self.allowedContent._kind == "data"
 
     @property 
     def contentIsElementsOnly(self):
@@ -545,8 +765,30 @@ class ElementStructure(Structure):
 
     @property 
     def valueType(self):
+        if self._valueType is not None:
+            return self._valueType
+
         return self.schema.getStructureByReference(self.valueTypeReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structures that this structure and its usage references refer to.
+
+        Returns
+        -------
+        None 
+        """
+
+        super().resolveReferences()
+
+        self._valueType = self.schema.getStructureByReference(self.valueTypeReference)
+
+        for attributeUsageReference in self.attributes:
+            attributeUsageReference.resolveReferences()
+
+        if self.allowedContent is not None:
+            self.allowedContent.resolveReferences()
+
     def setIsUsed(self):
         """
         Sets the isUsed property for this structure and the structures it depends on.
@@ -556,14 +798,18 @@ class ElementStructure(Structure):
         None 
         """
 
+        if self.isUsed:
+            return 
+
         super().setIsUsed()
 
         for attributeUsageReference in self.attributes:
-            logger.info(f"Setting isUsed for {self.reference}.{attributeUsageReference.attributeStructureReference}.")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Setting isUsed for %s.%s.", self.reference, attributeUsageReference.attributeStructureReference)
 
             attributeUsageReference.attributeStructure.setIsUsed()
 
-        if self.allowedContent != None:
+        if self.allowedContent is not None:
             self.allowedContent.setIsUsed()
 
     def toJSON(self):
@@ -584,7 +830,7 @@ class ElementStructure(Structure):
             "elementName": self.elementName,
             "canBeRootElement": self.canBeRootElement,
             "attributes": [a.toJSON() for a in self.attributes],
-            "allowedContent": None if self.allowedContent == None else self.allowedContent.toJSON(),
+            "allowedContent": None if self.allowedContent is None else self.allowedContent.toJSON(),
             "isSelfClosing": self.isSelfClosing,
             "lineBreaks": self.lineBreaks
         }
@@ -606,16 +852,35 @@ class PropertyStructure(Structure):
         the structure that the value of this property should be; can be a data structure, an array structure, or an object structure
     """
 
+    __slots__ = ("propertyName", "valueTypeReference", "_valueType")
+
     def __init__(self, reference = ""):
         super().__init__(reference)
 
         self.propertyName = ""
         self.valueTypeReference = ""
+        self._valueType = None 
 
     @property 
     def valueType(self):
+        if self._valueType is not None:
+            return self._valueType
+
         return self.schema.getStructureByReference(self.valueTypeReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structures that this structure refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        super().resolveReferences()
+
+        self._valueType = self.schema.getStructureByReference(self.valueTypeReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for this structure and the structures it depends on.
@@ -625,9 +890,12 @@ class PropertyStructure(Structure):
         None 
         """
 
+        if self.isUsed:
+            return 
+
         super().setIsUsed()
 
-        if self.valueType != None:
+        if self.valueType is not None:
             self.valueType.setIsUsed()
 
     def toJSON(self):
@@ -662,15 +930,36 @@ class ArrayStructure(Structure):
     itemType : Structure
         the structure that all of the items of this array conform to; can be a data structure, an array structure, or an object structure
     """
+
+    __slots__ = ("itemTypeReference", "_itemType")
+
     def __init__(self, reference = ""):
         super().__init__(reference)
 
         self.itemTypeReference = ""
 
+        self._itemType = None 
+
     @property 
     def itemType(self):
+        if self._itemType is not None:
+            return self._itemType
+
         return self.schema.getStructureByReference(self.itemTypeReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structures that this structure refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        super().resolveReferences()
+
+        self._itemType = self.schema.getStructureByReference(self.itemTypeReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for this structure and the structures it depends on.
@@ -680,9 +969,12 @@ class ArrayStructure(Structure):
         None 
         """
 
+        if self.isUsed:
+            return 
+
         super().setIsUsed()
 
-        if self.itemType != None:
+        if self.itemType is not None:
             self.itemType.setIsUsed()
 
     def toJSON(self):
@@ -718,12 +1010,29 @@ class ObjectStructure(Structure):
         a list of property usage references that defines the properties this object can have
     
     """
+
+    __slots__ = ("canBeRootObject", "properties")
+
     def __init__(self, reference = ""):
         super().__init__(reference)
 
         self.canBeRootObject = False 
         self.properties = []
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structures that this structure and its usage references refer to.
+
+        Returns
+        -------
+        None 
+        """
+
+        super().resolveReferences()
+
+        for propertyUsageReference in self.properties:
+            propertyUsageReference.resolveReferences()
+
     def setIsUsed(self):
         """
         Sets the isUsed property for this structure and the structures it depends on.
@@ -733,6 +1042,9 @@ class ObjectStructure(Structure):
         None 
         """
 
+        if self.isUsed:
+            return 
+
         super().setIsUsed()
 
         for propertyUsageReference in self.properties:
@@ -758,6 +1070,10 @@ class ObjectStructure(Structure):
         }
 
 
+# The kinds of allowed content that mean an element can contain other elements.
+_elementContentKinds = frozenset(["element", "anyElements", "list"])
+
+
 class UsageReference(object):
     """
     A usage reference base class. While structures *define* things like elements or objects, usage references are statements of how and where they are used.
@@ -770,9 +1086,26 @@ class UsageReference(object):
     schema : Schema
         the schema that this usage reference is used in.
     """
+
+    # A short name for the kind of usage reference, so that code walking allowed content can check it with a single 
+    # comparison instead of a chain of isinstance() calls. Every subclass sets its own.
+    _kind = ""
+    __slots__ = ("schema",)
+
     def __init__(self):
         self.schema = None 
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structure that this usage reference refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        pass
+
     def setIsUsed(self):
         pass
 
@@ -793,15 +1126,35 @@ class DataUsageReference(UsageReference):
     dataStructure : DataStructure
         the data structure that this usage reference pertains to
     """
+
+    _kind = "data"
+    __slots__ = ("dataStructureReference", "_dataStructure")
+
     def __init__(self):
         super().__init__()
 
         self.dataStructureReference = ""
 
+        self._dataStructure = None 
+
     @property 
     def dataStructure(self):
+        if self._dataStructure is not None:
+            return self._dataStructure
+
         return self.schema.getStructureByReference(self.dataStructureReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structure that this usage reference refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        self._dataStructure = self.schema.getStructureByReference(self.dataStructureReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for the structures this usage reference depends on.
@@ -811,7 +1164,7 @@ class DataUsageReference(UsageReference):
         None 
         """
 
-        if self.dataStructure != None:
+        if self.dataStructure is not None:
             self.dataStructure.setIsUsed()
 
     def toJSON(self):
@@ -846,17 +1199,36 @@ class AttributeUsageReference(UsageReference):
         the default value of this attribute in this context; overrides the default value set by the attribute structure and the default value set by the value data structure
     """
 
+    _kind = "attribute"
+    __slots__ = ("attributeStructureReference", "_attributeStructure", "isOptional", "defaultValue")
+
     def __init__(self):
         super().__init__()
 
         self.attributeStructureReference = ""
+
+        self._attributeStructure = None 
         self.isOptional = False 
         self.defaultValue = None 
 
     @property 
     def attributeStructure(self):
+        if self._attributeStructure is not None:
+            return self._attributeStructure
+
         return self.schema.getStructureByReference(self.attributeStructureReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structure that this usage reference refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        self._attributeStructure = self.schema.getStructureByReference(self.attributeStructureReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for the structures this usage reference depends on.
@@ -866,7 +1238,7 @@ class AttributeUsageReference(UsageReference):
         None 
         """
 
-        if self.attributeStructure != None:
+        if self.attributeStructure is not None:
             self.attributeStructure.setIsUsed()
 
     def toJSON(self):
@@ -904,18 +1276,38 @@ class ElementUsageReference(UsageReference):
     maximumNumberOfOccurrences : integer
         the maximum number of occurrences (inclusive) that there must be of this element
     """
+
+    _kind = "element"
+    __slots__ = ("elementStructureReference", "_elementStructure", "nExpression", "minimumNumberOfOccurrences", "maximumNumberOfOccurrences")
+
     def __init__(self):
         super().__init__()
 
         self.elementStructureReference= ""
+
+        self._elementStructure = None 
         self.nExpression = None 
         self.minimumNumberOfOccurrences = 1
         self.maximumNumberOfOccurrences = 1
 
     @property 
     def elementStructure(self):
+        if self._elementStructure is not None:
+            return self._elementStructure
+
         return self.schema.getStructureByReference(self.elementStructureReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structure that this usage reference refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        self._elementStructure = self.schema.getStructureByReference(self.elementStructureReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for the structures this usage reference depends on.
@@ -925,7 +1317,7 @@ class ElementUsageReference(UsageReference):
         None 
         """
 
-        if self.elementStructure != None:
+        if self.elementStructure is not None:
             self.elementStructure.setIsUsed()
 
     def toJSON(self):
@@ -962,17 +1354,36 @@ class PropertyUsageReference(UsageReference):
         the default value of this property in this context
     """
 
+    _kind = "property"
+    __slots__ = ("propertyStructureReference", "_propertyStructure", "isOptional", "defaultValue")
+
     def __init__(self):
         super().__init__()
 
         self.propertyStructureReference = ""
+
+        self._propertyStructure = None 
         self.isOptional = False 
         self.defaultValue = None 
 
     @property 
     def propertyStructure(self):
+        if self._propertyStructure is not None:
+            return self._propertyStructure
+
         return self.schema.getStructureByReference(self.propertyStructureReference)
 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structure that this usage reference refers to.
+
+        Returns
+        -------
+        None 
+        """
+
+        self._propertyStructure = self.schema.getStructureByReference(self.propertyStructureReference)
+
     def setIsUsed(self):
         """
         Sets the isUsed property for the structures this usage reference depends on.
@@ -982,7 +1393,7 @@ class PropertyUsageReference(UsageReference):
         None 
         """
 
-        if self.propertyStructure != None:
+        if self.propertyStructure is not None:
             self.propertyStructure.setIsUsed()
 
     def toJSON(self):
@@ -1005,28 +1416,36 @@ class AnyAttributesUsageReference(UsageReference):
     """
     A class for a wildcard usage reference that indicates that any attributes can be attached to an element.
     """
-    pass 
+
+    _kind = "anyAttributes"
+    __slots__ = ()
 
 
 class AnyElementsUsageReference(UsageReference):
     """
     A class for a wildcard usage reference that indicates that any element can be a subelement of an element.
     """
-    pass 
+
+    _kind = "anyElements"
+    __slots__ = ()
 
 
 class AnyTextUsageReference(UsageReference):
     """
     A class for a wildcard usage reference that indicates any text can be contained within an element.
     """
-    pass 
+
+    _kind = "anyText"
+    __slots__ = ()
 
 
 class AnyPropertiesUsageReference(UsageReference):
     """
     A class for a wildcard usage reference that indicates that any properties can be attached to an object.
     """
-    pass 
+
+    _kind = "anyProperties"
+    __slots__ = ()
 
 
 class StructureList(object):
@@ -1047,6 +1466,9 @@ class StructureList(object):
         whether this structure list contains an AnyTextUsageReference, at any level of depth
     """
 
+    _kind = "list"
+    __slots__ = ("schema", "structures")
+
     def __init__(self):
         self.schema = None 
 
@@ -1055,26 +1477,27 @@ class StructureList(object):
     @property 
     def containsText(self):
         for structureUsageReference in self.structures:
-            if isinstance(structureUsageReference, AnyTextUsageReference):
+            kind = structureUsageReference._kind
+
+            if kind == "anyText":
                 return True 
-            
-            if isinstance(structureUsageReference, UnorderedStructureList):
-                containsText = structureUsageReference.containsText()
 
-                if containsText == True:
-                    return True 
+            if kind == "list" and structureUsageReference.containsText:
+                return True 
 
-            if isinstance(structureUsageReference, OrderedStructureList):
-                containsText = structureUsageReference.containsText()
+        return False 
 
-                if containsText == True:
-                    return True 
+    def resolveReferences(self):
+        """
+        Looks up and stores the structures that the usage references in this list refer to.
 
-            if isinstance(structureUsageReference, StructureChoice):
-                containsText = structureUsageReference.containsText()
+        Returns
+        -------
+        None 
+        """
 
-                if containsText == True:
-                    return True 
+        for structureUsageReference in self.structures:
+            structureUsageReference.resolveReferences()
 
     def setIsUsed(self):
         """
@@ -1097,6 +1520,8 @@ class UnorderedStructureList(StructureList):
     Represents a type of structure list where the order is not important.
     """
 
+    __slots__ = ()
+
     def toJSON(self):
         """
         Converts this object to a dictionary, which can then be easily exported as JSON. Used for development purposes.
@@ -1117,6 +1542,8 @@ class OrderedStructureList(StructureList):
     Represents a type of structure list where the order is important.
     """
 
+    __slots__ = ()
+
     def toJSON(self):
         """
         Converts this object to a dictionary, which can then be easily exported as JSON. Used for development purposes.
@@ -1137,6 +1564,8 @@ class StructureChoice(StructureList):
     Represents a type of structure list where only one of the structures can be used.
     """
 
+    __slots__ = ()
+
     def toJSON(self):
         """
         Converts this object to a dictionary, which can then be easily exported as JSON. Used for development purposes.
@@ -1,6 +1,12 @@
+import io
+import json
+import os
+import tempfile
 import unittest
 from parameterized import parameterized
 from schemata.parser import *
+from schemata.exporters import SpecificationGenerator
+from schemata import cli
 
 
 class TestParsing(unittest.TestCase):
@@ -195,4 +201,157 @@ class TestParsing(unittest.TestCase):
         with self.assertRaises(SchemataParsingError) as context:
             parser._parseSubelementList(inputText, marker)
 
+    @parameterized.expand([
+        ["*any attributes*", 0, AnyAttributesUsageReference, 16],
+        ["*any elements*", 0, AnyElementsUsageReference, 14],
+        ["*any text*", 0, AnyTextUsageReference, 10],
+        ["*any properties*", 0, AnyPropertiesUsageReference, 16],
+        ["a, *any text*", 3, AnyTextUsageReference, 13],
+        ["*any thing*", 0, None, 0],
+        ["any text", 0, None, 0],
+    ])
+    def test_parse_any_usage_reference(self, inputText, p, usageReferenceType, position):
+        parser = Parser()
+        marker = Marker()
+        marker.position = p 
+
+        usageReference = parser._parseAnyUsageReference(inputText, marker)
+
+        if usageReferenceType is None:
+            self.assertIsNone(usageReference)
+        else:
+            self.assertTrue(isinstance(usageReference, usageReferenceType))
+
+        self.assertEqual(marker.position, position)
+
+    @parameterized.expand([
+        ["[a, b, c]", False],
+        ["[a, *any text*, c]", True],
+        ["{a, [b, {c, *any text*}]}", True],
+        ["[ {image / video / audio}, caption ]", False],
+    ])
+    def test_structure_list_contains_text(self, inputText, containsText):
+        parser = Parser()
+        marker = Marker()
+
+        subelementList = parser._parseSubelementList(inputText, marker)
+
+        self.assertEqual(subelementList.containsText, containsText)
+
+    def test_parse_structure_metadata(self):
+        parser = Parser()
+        schema = parser.parseSchema("root element a {\n    /*\n    Description:\n    Example Value: red\n    */\n}\n")
+
+        self.assertEqual(schema.getStructureByReference("a").metadata.exampleValue, "red")
+
+    def test_get_structure_by_reference_after_change(self):
+        parser = Parser()
+        schema = parser.parseSchema("root element a {\n}\n")
+
+        self.assertIsNone(schema.getStructureByReference("b"))
+
+        structure = ElementStructure("b")
+        schema.structures.append(structure)
+
+        self.assertIs(schema.getStructureByReference("b"), structure)
+
+        schema.structures = [structure]
+
+        self.assertIsNone(schema.getStructureByReference("a"))
+
+    def test_write_json(self):
+        parser = Parser()
+        schema = parser.parseSchema("root element a {\n    allowedContent: [b, *any text*];\n}\n\nelement b {\n}\n")
+
+        fileObject = io.StringIO()
+        schema.writeJSON(fileObject)
+
+        self.assertEqual(fileObject.getvalue(), json.dumps(schema.toJSON(), indent=2, ensure_ascii=False))
+
+
+class TestExporting(unittest.TestCase):
+
+    def test_generate_specification(self):
+        parser = Parser()
+        schema = parser.parseSchema(
+            "root element books {\n    /*\n    Description: A list of books.\n    */\n    attributes: size (optional), lang;\n"
+            "    allowedContent: [ book (n >= 0), {note / *any text*} ];\n}\n\n"
+            "dataType _size {\n    baseType: string;\n    allowedValues: 'small', 'large';\n}\n\n"
+            "dataType _lang {\n    baseType: string;\n    allowedPattern: '[a-z]+';\n}\n\n"
+            "attribute size {\n    valueType: _size;\n}\n\n"
+            "attribute lang {\n    /*\n    Description: The language.\n    Example Value: en\n    */\n    valueType: _lang;\n}\n\n"
+            "element book {\n    isSelfClosing: true;\n}\n\n"
+            "element note {\n    allowedContent: *any text*;\n}\n"
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            filePath = os.path.join(directory, "specification.md")
+            SpecificationGenerator().generateSpecification(schema, filePath)
+
+            with open(filePath, encoding="utf-8") as fo:
+                specification = fo.read()
+
+        self.assertIn("| `size` | Optional | one of: `small`, `large` |  |\n", specification)
+        self.assertIn("| `lang` | Required | a string with the pattern `[a-z]+` | The language. |\n", specification)
+        self.assertIn("### Possible Subelements\n\n- &lt;book&gt;\n- &lt;note&gt;\n\n", specification)
+        self.assertIn("```xml\n<books size=\"...\" lang=\"en\">\n    <book />\n    <note></note>\n</books>\n```\n", specification)
+        self.assertIn("```xml\n<book />\n```\n", specification)
+
+
+class TestCommandLine(unittest.TestCase):
+
+    @parameterized.expand([
+        ["0"],
+        ["-1"],
+    ])
+    def test_main_jobs_fail(self, jobs):
+        with self.assertRaises(SystemExit):
+            cli.main(["--jobs", jobs])
+
+    def test_needs_rebuild(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fp = os.path.join(directory, "a.schema")
+
+            for path in [fp, fp[:-7] + ".json", fp[:-7] + ".xsd"]:
+                with open(path, "w") as fo:
+                    fo.write("")
+
+                os.utime(path, (100, 100))
+
+            self.assertFalse(cli.needsRebuild(fp, 50))
+            self.assertTrue(cli.needsRebuild(fp, 150))
+
+            os.remove(fp[:-7] + ".xsd")
+
+            self.assertTrue(cli.needsRebuild(fp, 50))
+
+    def test_list_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ["a.schema", "b.schema", "a.xsd"]:
+                with open(os.path.join(directory, name), "w") as fo:
+                    fo.write("")
+
+            os.mkdir(os.path.join(directory, "c.schema"))
+
+            self.assertEqual(sorted(e.name for e in cli.listFiles(directory, "*.schema")), ["a.schema", "b.schema"])
+
+    def test_validate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            xsdPath = os.path.join(directory, "a.xsd")
+            validPath = os.path.join(directory, "valid.xml")
+            invalidPath = os.path.join(directory, "invalid.xml")
+
+            with open(xsdPath, "w") as fo:
+                fo.write("<xs:schema xmlns:xs=\"http://www.w3.org/2001/XMLSchema\"><xs:element name=\"a\" type=\"xs:integer\"/></xs:schema>")
+
+            with open(validPath, "w") as fo:
+                fo.write("<a>1</a>")
+
+            with open(invalidPath, "w") as fo:
+                fo.write("<a>x</a>")
+
+            schema = cli.loadXMLSchema(xsdPath)
 
+            for validate in [cli.validateStream, cli.validateBytes]:
+                self.assertIsNone(validate(validPath, schema))
+                self.assertIsNotNone(validate(invalidPath, schema))